@@ -1,4 +1,11 @@
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
 from celery import Celery
+from celery.signals import setup_logging, worker_process_init
 
 from .config import get_settings
 
@@ -23,14 +30,26 @@ celery_app.conf.update(
     worker_prefetch_multiplier=2,  # Allow 2 tasks per worker for better throughput
     worker_disable_rate_limits=True,
     worker_max_tasks_per_child=100,  # Restart workers after 100 tasks to prevent memory leaks
+    # Logging is configured in configure_worker_logging below
+    worker_hijack_root_logger=False,
     # Task timeouts to prevent stuck jobs - increased for batch processing
     task_time_limit=25 * 60,  # 25 minutes max per task
     task_soft_time_limit=20 * 60,  # 20 minutes soft limit
+    # Redis transport: redeliver only after the hard time limit has passed, and
+    # keep broadcast messages scoped to this app's keys
+    broker_transport_options={
+        "visibility_timeout": 60 * 60,
+        "fanout_prefix": True,
+        "fanout_patterns": True,
+    },
     # Routing for different task types
     task_routes={
         "app.tasks.process_document_ocr": {"queue": "ocr"},
         "app.tasks.process_document_tiling": {"queue": "processing"},
         "app.tasks.process_document_thumbnails": {"queue": "processing"},
+        # The pipeline rasterizes, encodes and (when needed) OCRs every page, so it
+        # runs on the core-pinned OCR worker rather than the processing pool
+        "app.tasks.process_document_pipeline": {"queue": "ocr"},
         "app.tasks.convert_document_to_pdf_task": {"queue": "processing"},
         "monitor_stuck_jobs": {"queue": "celery"},  # Use default queue for monitoring
     },
@@ -42,3 +61,117 @@ celery_app.conf.update(
         },
     },
 )
+
+
+_log_handlers: list[logging.Handler] = []
+_log_listener: QueueListener | None = None
+
+
+def _start_log_listener() -> None:
+    """Route root logging through a queue drained by a background thread.
+
+    Tasks only enqueue records, so a slow stdout or log file never blocks page
+    loops. The listener thread does not survive fork, so pool processes call
+    this again from worker_process_init with a fresh queue.
+    """
+    global _log_listener
+
+    if _log_listener is not None:
+        try:
+            _log_listener.stop()
+        except Exception:
+            pass
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(QueueHandler(log_queue))
+
+    _log_listener = QueueListener(log_queue, *_log_handlers, respect_handler_level=True)
+    _log_listener.start()
+
+
+@atexit.register
+def _stop_log_listener() -> None:
+    """Flush queued records on shutdown"""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+@setup_logging.connect
+def configure_worker_logging(**kwargs):
+    """Configure worker logging (replaces Celery's default root-logger setup).
+
+    Defaults to WARNING so per-page debug messages are dropped before they are
+    formatted; set WORKER_LOG_LEVEL=DEBUG to see them.
+    """
+    formatter = logging.Formatter(
+        "[%(asctime)s: %(levelname)s/%(processName)s] %(name)s: %(message)s"
+    )
+    handlers: list[logging.Handler] = [logging.StreamHandler()]
+    if settings.worker_log_file:
+        handlers.append(
+            RotatingFileHandler(
+                settings.worker_log_file, maxBytes=10 * 1024 * 1024, backupCount=5
+            )
+        )
+
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    _log_handlers[:] = handlers
+
+    logging.getLogger().setLevel(settings.worker_log_level)
+    _start_log_listener()
+
+
+@worker_process_init.connect
+def restart_log_listener(**kwargs):
+    """Start a log listener thread in each forked pool process"""
+    if _log_handlers:
+        _start_log_listener()
+
+
+@worker_process_init.connect
+def pin_worker_process(**kwargs):
+    """Pin each pool process to a single core (opt-in via WORKER_CPU_AFFINITY=1).
+
+    Keeps CPU-bound OCR work on a warm cache instead of migrating between cores.
+    """
+    if not settings.worker_cpu_affinity or not hasattr(os, "sched_setaffinity"):
+        return
+
+    from billiard import current_process
+
+    cores = sorted(os.sched_getaffinity(0))
+    index = getattr(current_process(), "index", 0) or 0
+    os.sched_setaffinity(0, {cores[index % len(cores)]})
+
+
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    """Give each forked pool process its own DB connections.
+
+    Connections inherited from the parent must not be shared across processes;
+    dispose(close=False) drops them without closing the parent's sockets.
+    """
+    from .db import engine
+
+    engine.dispose(close=False)
+
+
+@worker_process_init.connect
+def reset_s3_connections(**kwargs):
+    """Don't reuse S3 connections inherited from the parent process"""
+    from .s3_client import reset_s3_client
+
+    reset_s3_client()
+
+
+@worker_process_init.connect
+def warm_ocr_engine(**kwargs):
+    """Load the Tesseract model once per pool process, before the first task"""
+    from .processing import warm_tesseract
+
+    warm_tesseract()
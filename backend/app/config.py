@@ -16,6 +16,9 @@ class Settings:
     jwt_audience: str
     jwt_exp_minutes: int
     database_url: str
+    db_pool_size: int
+    db_max_overflow: int
+    db_pool_recycle: int
 
     s3_endpoint: str | None
     s3_region: str
@@ -30,6 +33,13 @@ class Settings:
     redis_url: str
     celery_broker_url: str
     celery_result_backend: str
+    worker_log_level: str
+    worker_log_file: str | None
+    worker_cpu_affinity: bool
+    page_workers: int
+    original_cache_dir: str
+    original_cache_ttl: int
+    original_cache_max_bytes: int
 
     def __init__(self) -> None:
         self.app_name = "Haqnow Community API"
@@ -39,6 +49,9 @@ class Settings:
         self.jwt_audience = os.getenv("JWT_AUDIENCE", "haqnow.clients")
         self.jwt_exp_minutes = int(os.getenv("JWT_EXP_MINUTES", "60"))
         self.database_url = os.getenv("DATABASE_URL", "sqlite+pysqlite:///./dev.db")
+        self.db_pool_size = int(os.getenv("DB_POOL_SIZE", "16"))
+        self.db_max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "8"))
+        self.db_pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 
         self.s3_endpoint = os.getenv("S3_ENDPOINT")
         self.s3_region = os.getenv("S3_REGION", "ch-gva-2")
@@ -57,9 +70,22 @@ class Settings:
         self.celery_result_backend = os.getenv(
             "CELERY_RESULT_BACKEND", "redis://localhost:6379/0"
         )
+        self.worker_log_level = os.getenv("WORKER_LOG_LEVEL", "WARNING").upper()
+        self.worker_log_file = os.getenv("WORKER_LOG_FILE")
+        self.worker_cpu_affinity = os.getenv("WORKER_CPU_AFFINITY", "0") == "1"
+        # Threads per task for page-level work (rasterized page -> image/OCR).
+        # Kept small: prefork workers already run one task per pool process, and
+        # each thread holds up to two rasterized pages in memory
+        self.page_workers = int(os.getenv("PAGE_WORKERS", "2"))
+        # Local scratch cache for original files downloaded from S3 by workers
+        self.original_cache_dir = os.getenv("ORIGINAL_CACHE_DIR", "/tmp/haqnow_cache")
+        self.original_cache_ttl = int(os.getenv("ORIGINAL_CACHE_TTL", "3600"))
+        self.original_cache_max_bytes = int(
+            os.getenv("ORIGINAL_CACHE_MAX_BYTES", str(2 * 1024 * 1024 * 1024))
+        )
 
 
-@lru_cache
+@lru_cache(maxsize=1)
 def _get_settings_cached() -> Settings:
     return Settings()
 
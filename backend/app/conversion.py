@@ -43,6 +43,11 @@ class DocumentConverter:
         if file_ext == ".pdf":
             return file_data, filename
 
+        # PDF content under another extension: skip LibreOffice entirely
+        if file_data[:5] == b"%PDF-":
+            logger.info(f"{filename} is already a PDF, skipping conversion")
+            return file_data, f"{base_name}.pdf"
+
         # Route to appropriate conversion method
         if file_ext in [".docx", ".doc"]:
             return DocumentConverter._convert_word_to_pdf(file_data, base_name)
@@ -1,6 +1,6 @@
 import os
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -25,16 +25,67 @@ if os.getenv("PYTEST_CURRENT_TEST"):
 else:
     # Normalize postgres URI for SQLAlchemy (psycopg2)
     db_url = settings.database_url.replace("postgres://", "postgresql+psycopg2://")
-    engine = create_engine(
-        db_url,
-        future=True,
-        connect_args={"check_same_thread": False}
-        if settings.database_url.startswith("sqlite")
-        else {},
-    )
+    if settings.database_url.startswith("sqlite"):
+        engine = create_engine(
+            db_url, future=True, connect_args={"check_same_thread": False}
+        )
+    else:
+        # Keep connections open across requests/tasks instead of reconnecting
+        engine = create_engine(
+            db_url,
+            future=True,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=True,
+        )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
+def ensure_column(table: str, column: str, ddl_type: str) -> None:
+    """Add a nullable column to an existing table if it is missing.
+
+    ``Base.metadata.create_all`` only creates missing tables, so columns added to
+    models after a table exists must be backfilled here.
+    """
+    existing = {col["name"] for col in inspect(engine).get_columns(table)}
+    if column in existing:
+        return
+    with engine.begin() as conn:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def ensure_cascade_foreign_key(table: str, column: str, ref_table: str) -> None:
+    """Make ``table.column`` reference ``ref_table.id`` with ON DELETE CASCADE.
+
+    ``create_all`` never alters existing constraints, so foreign keys created
+    before the cascade was declared are replaced here (PostgreSQL only). A
+    missing constraint is added NOT VALID so existing orphan rows don't block it.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+    name = f"{table}_{column}_fkey"
+    for fk in inspect(engine).get_foreign_keys(table):
+        if fk["constrained_columns"] == [column] and fk["referred_table"] == ref_table:
+            if (fk.get("options") or {}).get("ondelete", "").upper() == "CASCADE":
+                return
+            name = fk["name"]
+            break
+    else:
+        fk = None
+
+    with engine.begin() as conn:
+        if fk is not None:
+            conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+        conn.execute(
+            text(
+                f"ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) "
+                f"REFERENCES {ref_table}(id) ON DELETE CASCADE"
+                + ("" if fk is not None else " NOT VALID")
+            )
+        )
+
+
 def get_db():
     db = SessionLocal()
     try:
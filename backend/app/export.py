@@ -10,7 +10,7 @@ from PIL import Image
 from .config import get_settings
 from .db import SessionLocal
 from .models import Document, Redaction
-from .processing import rasterize_pdf_pages
+from .processing import rasterize_pdf_page, rasterize_pdf_pages
 from .redaction import get_redaction_service
 from .s3_client import get_s3_client, upload_to_s3
 
@@ -30,17 +30,18 @@ class ExportService:
             s3_client = get_s3_client()
         except Exception:
             s3_client = None
-        # Try S3 previews first (PNG)
+        # Try S3 previews first (WEBP, then legacy PNG)
         if s3_client is not None:
-            try:
-                preview_key = f"previews/{document_id}/page_{page_number}.png"
-                resp = s3_client.get_object(
-                    Bucket=self.settings.s3_bucket_thumbnails, Key=preview_key
-                )
-                data = resp["Body"].read()
-                return Image.open(io.BytesIO(data))
-            except Exception:
-                pass
+            for ext in ("webp", "png"):
+                try:
+                    preview_key = f"previews/{document_id}/page_{page_number}.{ext}"
+                    resp = s3_client.get_object(
+                        Bucket=self.settings.s3_bucket_thumbnails, Key=preview_key
+                    )
+                    data = resp["Body"].read()
+                    return Image.open(io.BytesIO(data))
+                except Exception:
+                    pass
             # Try thumbnails (WEBP)
             try:
                 thumb_key = f"thumbnails/{document_id}/page_{page_number}.webp"
@@ -52,11 +53,20 @@ class ExportService:
             except Exception:
                 pass
         # Local fallbacks
-        local_preview = f"/srv/processed/previews/{document_id}/page_{page_number}.png"
+        local_preview = f"/srv/processed/previews/{document_id}/page_{page_number}.webp"
+        local_legacy = f"/srv/processed/previews/{document_id}/page_{page_number}.png"
         local_thumb = f"/srv/processed/thumbnails/{document_id}/page_{page_number}.webp"
-        app_preview = f"/app/processed/previews/{document_id}/page_{page_number}.png"
+        app_preview = f"/app/processed/previews/{document_id}/page_{page_number}.webp"
+        app_legacy = f"/app/processed/previews/{document_id}/page_{page_number}.png"
         app_thumb = f"/app/processed/thumbnails/{document_id}/page_{page_number}.webp"
-        for path in [app_preview, app_thumb, local_preview, local_thumb]:
+        for path in [
+            app_preview,
+            app_legacy,
+            app_thumb,
+            local_preview,
+            local_legacy,
+            local_thumb,
+        ]:
             try:
                 if os.path.exists(path) and os.path.isfile(path):
                     with open(path, "rb") as f:
@@ -482,9 +492,8 @@ class ExportService:
         """Get original version of a page image (supports PDFs and images)."""
         # Try PDF rasterization first
         try:
-            pages = rasterize_pdf_pages(original_data, dpi=dpi)
-            if page_number < len(pages):
-                _, page_image_data = pages[page_number]
+            page_image_data = rasterize_pdf_page(original_data, page_number, dpi=dpi)
+            if page_image_data is not None:
                 return Image.open(io.BytesIO(page_image_data))
         except Exception:
             pass
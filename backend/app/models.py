@@ -67,11 +67,34 @@ class Document(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Child rows are removed by the database's ON DELETE CASCADE; passive_deletes
+    # stops the ORM from loading them just to delete them one by one
+    processing_jobs: Mapped[list["ProcessingJob"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    comments: Mapped[list["Comment"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    redactions: Mapped[list["Redaction"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    shares: Mapped[list["DocumentShare"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    contents: Mapped[list["DocumentContent"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+    texts: Mapped[list["DocumentText"]] = relationship(
+        cascade="all, delete-orphan", passive_deletes=True
+    )
+
 
 class ProcessingJob(Base):
     __tablename__ = "processing_jobs"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    document_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    document_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
+    )
     job_type: Mapped[str] = mapped_column(
         String(50), nullable=False
     )  # "tiling", "thumbnail", "ocr", etc.
@@ -79,6 +102,9 @@ class ProcessingJob(Base):
         String(32), default="queued"
     )  # "queued", "running", "completed", "failed"
     celery_task_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    result_etag: Mapped[str | None] = mapped_column(
+        String(255), nullable=True
+    )  # ETag of the S3 object produced by the job (idempotent retries)
     error_message: Mapped[str | None] = mapped_column(String(1000), nullable=True)
     progress: Mapped[int] = mapped_column(Integer, default=0)  # 0-100
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -90,7 +116,7 @@ class Comment(Base):
     __tablename__ = "comments"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     document_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("documents.id"), nullable=False
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False
@@ -114,7 +140,7 @@ class Redaction(Base):
     __tablename__ = "redactions"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     document_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("documents.id"), nullable=False
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
     user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False
@@ -132,7 +158,7 @@ class DocumentShare(Base):
     __tablename__ = "document_shares"
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     document_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("documents.id"), nullable=False
+        Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False
     )
     shared_by_user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id"), nullable=False
@@ -179,7 +205,10 @@ class DocumentContent(Base):
     __tablename__ = "document_contents"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("documents.id"), nullable=False, index=True
+        Integer,
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     markdown: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -193,7 +222,10 @@ class DocumentText(Base):
     __tablename__ = "document_texts"
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("documents.id"), nullable=False, index=True
+        Integer,
+        ForeignKey("documents.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
     )
     text: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
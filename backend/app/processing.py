@@ -1,8 +1,13 @@
 import io
+import logging
 import math
 import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
 
 import fitz  # PyMuPDF
 import pytesseract
@@ -11,6 +16,18 @@ from PIL import Image, ImageDraw
 from .config import get_settings
 from .s3_client import upload_to_s3
 
+try:  # Optional: libvips encodes WebP tiles much faster than Pillow
+    import pyvips
+except (ImportError, OSError):  # OSError: binding installed but libvips missing
+    pyvips = None
+
+try:  # Optional: in-process libtesseract, no subprocess or model load per page
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
+
+logger = logging.getLogger(__name__)
+
 ## S3 download helper moved to app.s3_client.download_from_s3 to avoid duplication
 
 
@@ -58,42 +75,101 @@ def generate_single_page_image(image_data: bytes, dpi: int = 300) -> bytes:
     return output.getvalue()
 
 
-def rasterize_pdf_pages(pdf_data: bytes, dpi: int = 300) -> List[Tuple[int, bytes]]:
-    """Rasterize PDF pages to PNG images at specified DPI"""
+def _open_pdf(pdf_data: bytes) -> Tuple[fitz.Document, bytes]:
+    """Open PDF bytes, substituting a placeholder page if the stream is invalid.
+
+    Returns the open document and the bytes it was opened from.
+    """
     try:
-        doc = fitz.open(stream=pdf_data, filetype="pdf")
+        return fitz.open(stream=pdf_data, filetype="pdf"), pdf_data
     except Exception as e:
         if "Failed to open stream" in str(e):
             # Create a minimal placeholder PDF if the stream is invalid
-            print(f"Invalid PDF stream, creating placeholder: {e}")
+            logger.warning(f"Invalid PDF stream, creating placeholder: {e}")
             placeholder_doc = fitz.open()
             page = placeholder_doc.new_page()
             page.insert_text((72, 72), "Invalid PDF - placeholder page")
             placeholder_bytes = placeholder_doc.tobytes()
             placeholder_doc.close()
-            doc = fitz.open(stream=placeholder_bytes, filetype="pdf")
-        else:
-            raise
-    pages = []
+            return (
+                fitz.open(stream=placeholder_bytes, filetype="pdf"),
+                placeholder_bytes,
+            )
+        raise
 
-    for page_num in range(len(doc)):
-        page = doc.load_page(page_num)
 
-        # Calculate matrix for desired DPI
-        zoom = dpi / 72.0  # 72 DPI is default
-        mat = fitz.Matrix(zoom, zoom)
+def _render_pdf_page(
+    doc: fitz.Document, page_num: int, dpi: int, grayscale: bool = False
+) -> bytes:
+    """Render one page of an open PDF to PNG bytes at the given DPI.
 
-        # Render page to pixmap
+    ``grayscale`` renders a single-channel image without alpha (a third of the
+    RGB pixel data), which is all Tesseract needs.
+    """
+    page = doc.load_page(page_num)
+
+    # Calculate matrix for desired DPI
+    zoom = dpi / 72.0  # 72 DPI is default
+    mat = fitz.Matrix(zoom, zoom)
+
+    # Render page to pixmap and convert to PNG bytes
+    if grayscale:
+        pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY, alpha=False)
+    else:
         pix = page.get_pixmap(matrix=mat)
+    png_data = pix.tobytes("png")
+    pix = None  # Free memory
+    return png_data
+
+
+class RasterizedPages:
+    """Lazily rasterized PDF pages.
+
+    ``len()`` gives the page count without rendering anything, and iterating
+    yields ``(page_num, png_bytes)`` one page at a time so only the pages still
+    being processed are held in memory.
+    """
+
+    def __init__(self, pdf_data: bytes, dpi: int = 300, grayscale: bool = False):
+        # Open eagerly so invalid input raises here rather than mid-iteration
+        doc, self.pdf_data = _open_pdf(pdf_data)
+        self.page_count = len(doc)
+        doc.close()
+        self.dpi = dpi
+        self.grayscale = grayscale
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        doc = fitz.open(stream=self.pdf_data, filetype="pdf")
+        try:
+            for page_num in range(len(doc)):
+                yield page_num, _render_pdf_page(
+                    doc, page_num, self.dpi, grayscale=self.grayscale
+                )
+        finally:
+            doc.close()
 
-        # Convert to PNG bytes
-        png_data = pix.tobytes("png")
-        pages.append((page_num, png_data))
 
-        pix = None  # Free memory
+def rasterize_pdf_pages(
+    pdf_data: bytes, dpi: int = 300, grayscale: bool = False
+) -> RasterizedPages:
+    """Rasterize PDF pages to PNG images at specified DPI (rendered lazily)"""
+    return RasterizedPages(pdf_data, dpi=dpi, grayscale=grayscale)
 
-    doc.close()
-    return pages
+
+def rasterize_pdf_page(
+    pdf_data: bytes, page_number: int, dpi: int = 300
+) -> bytes | None:
+    """Rasterize a single PDF page to PNG; returns None if the page does not exist"""
+    doc, _ = _open_pdf(pdf_data)
+    try:
+        if not 0 <= page_number < len(doc):
+            return None
+        return _render_pdf_page(doc, page_number, dpi)
+    finally:
+        doc.close()
 
 
 def rasterize_image(image_data: bytes, dpi: int = 300) -> List[Tuple[int, bytes]]:
@@ -127,11 +203,85 @@ def rasterize_image(image_data: bytes, dpi: int = 300) -> List[Tuple[int, bytes]
     return [(0, png_data)]  # Single page for images
 
 
-def generate_tiles(
-    image_data: bytes, tile_size: int = 256, quality: int = 80
+def _generate_tiles_vips(
+    image_data: bytes, tile_size: int, quality: int
 ) -> List[Tuple[int, int, bytes]]:
-    """Generate WebP tiles from page image"""
-    image = Image.open(io.BytesIO(image_data))
+    """libvips implementation of generate_tiles (same tile layout and padding)"""
+    image = pyvips.Image.new_from_buffer(image_data, "")
+    if image.hasalpha():
+        image = image.flatten(background=[255, 255, 255])
+    if image.bands < 3:
+        image = image.colourspace("srgb")
+    # Decode once; the crops below then read from memory
+    image = image.copy_memory()
+    width, height = image.width, image.height
+
+    tiles = []
+    for y in range(math.ceil(height / tile_size)):
+        for x in range(math.ceil(width / tile_size)):
+            left = x * tile_size
+            top = y * tile_size
+            tile = image.crop(
+                left, top, min(tile_size, width - left), min(tile_size, height - top)
+            )
+
+            # If tile is smaller than tile_size, pad with white
+            if (tile.width, tile.height) != (tile_size, tile_size):
+                tile = tile.embed(
+                    0,
+                    0,
+                    tile_size,
+                    tile_size,
+                    extend="background",
+                    background=[255, 255, 255],
+                )
+
+            tiles.append((x, y, tile.webpsave_buffer(Q=quality, effort=2)))
+
+    return tiles
+
+
+def _tile_arrays(image: Image.Image, tile_size: int) -> list:
+    """Split a page into white-padded RGB tile arrays without encoding them.
+
+    Each tile is a view into one decoded page array.
+    """
+    import numpy as np
+
+    arr = np.asarray(image.convert("RGB"))
+    height, width = arr.shape[:2]
+    padded = np.full(
+        (
+            math.ceil(height / tile_size) * tile_size,
+            math.ceil(width / tile_size) * tile_size,
+            3,
+        ),
+        255,
+        dtype=np.uint8,
+    )
+    padded[:height, :width] = arr
+
+    return [
+        (x, y, padded[top : top + tile_size, left : left + tile_size])
+        for y, top in enumerate(range(0, padded.shape[0], tile_size))
+        for x, left in enumerate(range(0, padded.shape[1], tile_size))
+    ]
+
+
+def generate_tiles_from_image(
+    image: Image.Image,
+    tile_size: int = 256,
+    quality: int = 80,
+    return_arrays: bool = False,
+) -> List[Tuple[int, int, bytes]]:
+    """Generate WebP tiles from an already decoded page image (Pillow)
+
+    With ``return_arrays`` the tiles are returned as NumPy RGB arrays instead
+    of encoded WebP, for callers that only inspect pixels.
+    """
+    if return_arrays:
+        return _tile_arrays(image, tile_size)
+
     width, height = image.size
 
     # Calculate number of tiles needed
@@ -167,6 +317,25 @@ def generate_tiles(
     return tiles
 
 
+def generate_tiles(
+    image_data: bytes,
+    tile_size: int = 256,
+    quality: int = 80,
+    return_arrays: bool = False,
+) -> List[Tuple[int, int, bytes]]:
+    """Generate WebP tiles from page image (libvips when available, else Pillow)
+
+    With ``return_arrays`` the tiles are returned as NumPy RGB arrays instead
+    of encoded WebP, for callers that only inspect pixels.
+    """
+    if pyvips is not None and not return_arrays:
+        return _generate_tiles_vips(image_data, tile_size, quality)
+
+    return generate_tiles_from_image(
+        Image.open(io.BytesIO(image_data)), tile_size, quality, return_arrays
+    )
+
+
 def generate_thumbnail(
     image_data: bytes, max_size: Tuple[int, int] = (2400, 3600)
 ) -> bytes:
@@ -182,7 +351,82 @@ def generate_thumbnail(
     return output.getvalue()
 
 
-def extract_text_from_image(image_data: bytes, language: str = "eng") -> str:
+def generate_preview_image(image_data: bytes, quality: int = 85) -> bytes:
+    """Encode a full-resolution page preview as lossy WebP"""
+    if pyvips is not None:
+        image = pyvips.Image.new_from_buffer(image_data, "")
+        return image.webpsave_buffer(Q=quality)
+
+    image = Image.open(io.BytesIO(image_data))
+    output = io.BytesIO()
+    image.save(output, format="WebP", quality=quality)
+    return output.getvalue()
+
+
+# LSTM-only engine, single uniform text block: skips Tesseract's page layout
+# analysis, which dominates OCR time on ordinary pages of text
+FAST_OCR_CONFIG = "--oem 1 --psm 6"
+
+
+# Tesseract API handles are not thread-safe and each one loads the language
+# model, so idle handles are pooled per (language, oem, psm) for the life of the
+# worker process. Per-task page threads check one out instead of creating their own
+_tess_pool: dict[tuple[str, int, int], queue.SimpleQueue] = {}
+_tess_pool_lock = threading.Lock()
+
+
+def _tess_options(config: str) -> tuple[int, int] | None:
+    """(oem, psm) from a CLI-style config, or None if it has other options"""
+    if re.sub(r"--(oem|psm)\s+\d+", "", config).strip():
+        return None
+    options = dict(re.findall(r"--(oem|psm)\s+(\d+)", config))
+    # Same defaults as the tesseract CLI: default engine, automatic segmentation
+    return int(options.get("oem", 3)), int(options.get("psm", 3))
+
+
+@contextmanager
+def _tess_api(language: str, oem: int, psm: int):
+    with _tess_pool_lock:
+        handles = _tess_pool.setdefault((language, oem, psm), queue.SimpleQueue())
+    try:
+        api = handles.get_nowait()
+    except queue.Empty:
+        api = PyTessBaseAPI(lang=language, oem=oem, psm=psm)
+    try:
+        yield api
+    finally:
+        handles.put(api)
+
+
+def warm_tesseract(language: str = "eng", config: str = FAST_OCR_CONFIG) -> None:
+    """Load one pooled Tesseract handle ahead of the first OCR task"""
+    options = _tess_options(config)
+    if PyTessBaseAPI is None or options is None:
+        return
+    with _tess_api(language, *options):
+        pass
+
+
+def _ocr_with_tesserocr(image: Image.Image, language: str, config: str) -> str | None:
+    """OCR through a pooled tesserocr handle.
+
+    Returns None when tesserocr isn't installed or ``config`` has options
+    other than --oem/--psm, so the caller falls back to pytesseract.
+    """
+    if PyTessBaseAPI is None:
+        return None
+    options = _tess_options(config)
+    if options is None:
+        return None
+
+    with _tess_api(language, *options) as api:
+        api.SetImage(image)
+        return api.GetUTF8Text()
+
+
+def extract_text_from_image(
+    image_data: bytes, language: str = "eng", config: str = ""
+) -> str:
     """Extract text from image using optimized Tesseract OCR"""
     try:
         image = Image.open(io.BytesIO(image_data))
@@ -200,12 +444,13 @@ def extract_text_from_image(image_data: bytes, language: str = "eng") -> str:
         if image.mode != 'L':
             image = image.convert('L')
 
-        # Extract text without custom config to avoid CLI parsing issues
-        text = pytesseract.image_to_string(image, lang=language)
+        text = _ocr_with_tesserocr(image, language, config)
+        if text is None:
+            text = pytesseract.image_to_string(image, lang=language, config=config)
 
         return text.strip()
     except Exception as e:
-        print(f"OCR failed: {e}")
+        logger.warning(f"OCR failed: {e}")
         return ""
 
 
@@ -218,7 +463,7 @@ def extract_text_from_pdf(pdf_data: bytes) -> List[Tuple[int, str]]:
         doc = fitz.open(stream=pdf_data, filetype="pdf")
     except Exception as e:
         if "Failed to open stream" in str(e):
-            print(f"Invalid PDF stream for text extraction: {e}")
+            logger.warning(f"Invalid PDF stream for text extraction: {e}")
             return []  # Return empty list if PDF is invalid
         else:
             raise
@@ -234,7 +479,7 @@ def extract_text_from_pdf(pdf_data: bytes) -> List[Tuple[int, str]]:
         return results
     except Exception as e:
         # If PDF parsing fails, return empty to allow OCR fallback
-        print(f"PDF text extraction failed: {e}")
+        logger.warning(f"PDF text extraction failed: {e}")
         return []
 
 
@@ -271,7 +516,7 @@ def get_document_info(file_data: bytes, filename: str) -> dict:
             doc = fitz.open(stream=file_data, filetype="pdf")
         except Exception as e:
             if "Failed to open stream" in str(e):
-                print(f"Invalid PDF stream in get_document_info: {e}")
+                logger.warning(f"Invalid PDF stream in get_document_info: {e}")
                 return info  # Return basic info if PDF is invalid
             else:
                 raise
@@ -1,4 +1,5 @@
 import asyncio
+import gzip
 import json
 import logging
 import os
@@ -248,7 +249,10 @@ Answer:"""
                 s3_client = get_s3_client()
                 ocr_key = f"ocr/{document_id}/text.json"
                 response = s3_client.get_object(Bucket="ocr", Key=ocr_key)
-                ocr_data = json.loads(response["Body"].read().decode("utf-8"))
+                body = response["Body"].read()
+                if response.get("ContentEncoding") == "gzip":
+                    body = gzip.decompress(body)
+                ocr_data = json.loads(body.decode("utf-8"))
 
                 # Extract text from all pages
                 text_parts = []
@@ -8,8 +8,8 @@ import fitz  # PyMuPDF
 from PIL import Image, ImageDraw
 
 from .config import get_settings
-from .processing import generate_thumbnail, generate_tiles, rasterize_pdf_pages
-from .s3_client import get_s3_client, upload_to_s3
+from .processing import generate_thumbnail, generate_tiles, rasterize_pdf_page
+from .s3_client import get_s3_client, upload_many_to_s3, upload_to_s3
 
 logger = logging.getLogger(__name__)
 
@@ -51,13 +51,11 @@ class RedactionService:
                 return {"success": False, "error": "Original document not found"}
 
             # Rasterize the specific page
-            pages = rasterize_pdf_pages(file_data, dpi=300)
+            page_image_data = rasterize_pdf_page(file_data, page_number, dpi=300)
 
-            if page_number >= len(pages):
+            if page_image_data is None:
                 return {"success": False, "error": f"Page {page_number} not found"}
 
-            page_num, page_image_data = pages[page_number]
-
             # Load the page image
             page_image = Image.open(io.BytesIO(page_image_data))
 
@@ -77,11 +75,17 @@ class RedactionService:
             tiles = generate_tiles(redacted_image_data, tile_size=256, quality=80)
 
             # Upload new tiles
-            for x, y, tile_data in tiles:
-                tile_key = (
-                    f"tiles/{document_id}/page_{page_number}/redacted/tile_{x}_{y}.webp"
-                )
-                upload_to_s3("derivatives", tile_key, tile_data, "image/webp")
+            upload_many_to_s3(
+                "derivatives",
+                (
+                    (
+                        f"tiles/{document_id}/page_{page_number}/redacted/tile_{x}_{y}.webp",
+                        tile_data,
+                    )
+                    for x, y, tile_data in tiles
+                ),
+                "image/webp",
+            )
 
             # Generate new thumbnail
             thumbnail = generate_thumbnail(redacted_image_data, max_size=(200, 300))
@@ -216,20 +220,26 @@ class RedactionService:
             file_data = response["Body"].read()
 
             # Rasterize the specific page (clean version)
-            pages = rasterize_pdf_pages(file_data, dpi=300)
+            page_image_data = rasterize_pdf_page(file_data, page_number, dpi=300)
 
-            if page_number >= len(pages):
+            if page_image_data is None:
                 return {"success": False, "error": f"Page {page_number} not found"}
 
-            page_num, page_image_data = pages[page_number]
-
             # Generate new clean tiles
             tiles = generate_tiles(page_image_data, tile_size=256, quality=80)
 
             # Upload clean tiles (overwrite redacted ones)
-            for x, y, tile_data in tiles:
-                tile_key = f"tiles/{document_id}/page_{page_number}/tile_{x}_{y}.webp"
-                upload_to_s3("derivatives", tile_key, tile_data, "image/webp")
+            upload_many_to_s3(
+                "derivatives",
+                (
+                    (
+                        f"tiles/{document_id}/page_{page_number}/tile_{x}_{y}.webp",
+                        tile_data,
+                    )
+                    for x, y, tile_data in tiles
+                ),
+                "image/webp",
+            )
 
             # Generate new clean thumbnail
             thumbnail = generate_thumbnail(page_image_data, max_size=(200, 300))
@@ -5,7 +5,14 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
 
-from .db import Base, SessionLocal, engine, get_db
+from .db import (
+    Base,
+    SessionLocal,
+    engine,
+    ensure_cascade_foreign_key,
+    ensure_column,
+    get_db,
+)
 from .models import ApiKey, User
 from .schemas import (
     ApiKeyCreate,
@@ -124,6 +131,16 @@ def startup_migrate():
     DB remains the source of truth.
     """
     Base.metadata.create_all(bind=engine)
+    ensure_column("processing_jobs", "result_etag", "VARCHAR(255)")
+    for child_table in (
+        "processing_jobs",
+        "comments",
+        "redactions",
+        "document_shares",
+        "document_contents",
+        "document_texts",
+    ):
+        ensure_cascade_foreign_key(child_table, "document_id", "documents")
     from .models import User
 
     db = SessionLocal()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from celery import group
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
 from fastapi.responses import FileResponse, Response
 from sqlalchemy.orm import Session
@@ -23,6 +24,7 @@ from .s3_client import generate_presigned_upload
 from .schemas import (
     ContentDocCreate,
     ContentDocOut,
+    DocumentBulkCreate,
     DocumentCreate,
     DocumentOut,
     DocumentShareCreate,
@@ -35,11 +37,12 @@ from .schemas import (
     PresignedUploadResponse,
 )
 from .tasks import (
+    _clear_original_cache,
+    _evict_original_cache,
     convert_document_to_pdf_task,
     get_local_processed_path,
-    process_document_ocr,
-    process_document_thumbnails,
-    process_document_tiling,
+    process_document_pipeline,
+    render_page_preview,
 )
 
 router = APIRouter(prefix="/documents", tags=["documents"])
@@ -364,11 +367,10 @@ def list_groups(db: Session = Depends(get_db), current_user=Depends(get_current_
     )
 
 
-@router.post("/", response_model=DocumentOut)
-def create_document(payload: DocumentCreate, db: Session = Depends(get_db)):
-    """Register a document after successful upload"""
+def _new_document(payload: DocumentCreate) -> Document:
+    """Build an unsaved Document from a create payload"""
     # TODO: Add proper auth middleware to get uploader_id
-    document = Document(
+    return Document(
         title=payload.title,
         description=payload.description,
         source=payload.source,
@@ -379,6 +381,12 @@ def create_document(payload: DocumentCreate, db: Session = Depends(get_db)):
         event_date=payload.event_date,
         filing_date=payload.filing_date,
     )
+
+
+@router.post("/", response_model=DocumentOut)
+def create_document(payload: DocumentCreate, db: Session = Depends(get_db)):
+    """Register a document after successful upload"""
+    document = _new_document(payload)
     db.add(document)
     db.commit()
     db.refresh(document)
@@ -389,17 +397,42 @@ def create_document(payload: DocumentCreate, db: Session = Depends(get_db)):
     return document
 
 
+@router.post("/bulk", response_model=list[DocumentOut])
+def create_documents_bulk(payload: DocumentBulkCreate, db: Session = Depends(get_db)):
+    """Register several documents in one request"""
+    documents = [_new_document(item) for item in payload.documents]
+    # One INSERT batch and commit for all documents
+    db.add_all(documents)
+    db.commit()
+
+    for document in documents:
+        _enqueue_processing_jobs(document.id, db)
+
+    return documents
+
+
 def _enqueue_processing_jobs(document_id: int, db: Session):
     """Enqueue background processing jobs for a document"""
     _enqueue_processing_jobs_with_delay(document_id, db, 0)
 
 
+def _processing_job_types(title: str) -> list[str]:
+    """Job types for a document; PDFs need no conversion job"""
+    job_types = ["tiling", "thumbnails", "ocr"]
+    if not title.lower().endswith(".pdf"):
+        job_types.insert(0, "conversion")
+    return job_types
+
+
 def _enqueue_processing_jobs_with_delay(
     document_id: int, db: Session, delay_seconds: int = 0
 ):
     """Enqueue background processing jobs for a document with optional delay"""
     import os
 
+    title = db.query(Document.title).filter(Document.id == document_id).scalar()
+    job_types = _processing_job_types(title or "")
+
     # FIXED: Only skip Celery in actual test environment with proper test detection
     if os.getenv("PYTEST_CURRENT_TEST") and "test" in os.getenv(
         "PYTEST_CURRENT_TEST", ""
@@ -408,7 +441,7 @@ def _enqueue_processing_jobs_with_delay(
             f"DEBUG: In actual test mode, creating jobs without Celery for document {document_id}"
         )
         batch = []
-        for job_type in ["conversion", "tiling", "thumbnails", "ocr"]:
+        for job_type in job_types:
             batch.append(
                 ProcessingJob(
                     document_id=document_id,
@@ -424,51 +457,63 @@ def _enqueue_processing_jobs_with_delay(
     print(
         f"DEBUG: Production mode - submitting jobs to Celery for document {document_id}"
     )
-    job_types = ["conversion", "tiling", "thumbnails", "ocr"]
-
-    for i, job_type in enumerate(job_types):
-        # Create job record
-        job = ProcessingJob(
+    jobs = {
+        job_type: ProcessingJob(
             document_id=document_id,
             job_type=job_type,
             status="queued",
         )
-        db.add(job)
-        db.commit()
-        db.refresh(job)
+        for job_type in job_types
+    }
+    db.add_all(jobs.values())
+    db.commit()
 
-        # FIXED: Always use zero delay for immediate processing (no hardcoded delays)
-        task_delay = 0
-        print(
-            f"DEBUG: Submitting {job_type} task immediately for document {document_id}"
+    # Tiling, thumbnails and OCR share one task so pages are rasterized only once
+    pipeline_jobs = [jobs["tiling"], jobs["thumbnails"], jobs["ocr"]]
+    dispatches = [
+        (
+            pipeline_jobs,
+            process_document_pipeline.s(
+                document_id, {job.job_type: job.id for job in pipeline_jobs}
+            ),
+        ),
+    ]
+    if "conversion" in jobs:
+        dispatches.insert(
+            0,
+            (
+                [jobs["conversion"]],
+                convert_document_to_pdf_task.s(document_id, jobs["conversion"].id),
+            ),
         )
 
-        try:
-            if job_type == "conversion":
-                task = convert_document_to_pdf_task.delay(document_id, job.id)
-            elif job_type == "tiling":
-                task = process_document_tiling.delay(document_id, job.id)
-            elif job_type == "thumbnails":
-                task = process_document_thumbnails.delay(document_id, job.id)
-            elif job_type == "ocr":
-                task = process_document_ocr.delay(document_id, job.id)
-
-            # Update job with Celery task ID
-            job.celery_task_id = task.id
-            db.commit()
-            print(f"DEBUG: Successfully submitted {job_type} task {task.id}")
+    all_jobs = [job for dispatched_jobs, _ in dispatches for job in dispatched_jobs]
+    job_types = ", ".join(job.job_type for job in all_jobs)
+    print(f"DEBUG: Submitting {job_types} tasks immediately for document {document_id}")
 
-        except Exception as e:
-            # If task dispatch fails, mark job as failed and log the error
-            print(
-                f"ERROR: Failed to dispatch {job_type} task for document {document_id}: {e}"
-            )
-            import traceback
+    try:
+        # Publish every task for this document over one producer connection
+        result = group(signature for _, signature in dispatches).apply_async()
+
+        # Update jobs with Celery task IDs
+        for (dispatched_jobs, _), task in zip(dispatches, result.results):
+            for job in dispatched_jobs:
+                job.celery_task_id = task.id
+        db.commit()
+        print(f"DEBUG: Successfully submitted {job_types} tasks (group {result.id})")
+
+    except Exception as e:
+        # If task dispatch fails, mark jobs as failed and log the error
+        print(
+            f"ERROR: Failed to dispatch {job_types} tasks for document {document_id}: {e}"
+        )
+        import traceback
 
-            traceback.print_exc()
+        traceback.print_exc()
+        for job in all_jobs:
             job.status = "failed"
             job.error_message = f"Failed to dispatch task: {str(e)}"
-            db.commit()
+        db.commit()
 
 
 @router.get("/", response_model=list[DocumentOut])
@@ -688,6 +733,10 @@ def delete_document(document_id: int, db: Session = Depends(get_db)):
     # Delete associated processing jobs first
     db.query(ProcessingJob).filter(ProcessingJob.document_id == document_id).delete()
 
+    # Drop cached original bytes while the title is still loaded (a miss only
+    # costs a re-download, so this is safe even if the delete fails)
+    _evict_original_cache(get_settings(), document)
+
     # Delete the document
     db.delete(document)
     db.commit()
@@ -705,6 +754,8 @@ def delete_all_documents(db: Session = Depends(get_db)):
     db.query(Document).delete()
     db.commit()
 
+    _clear_original_cache(get_settings())
+
     return {"message": "All documents deleted successfully"}
 
 
@@ -1086,13 +1137,35 @@ async def get_document_thumbnail(
 
         settings = get_settings()
 
-        # Try high-res preview from SOS
-        try:
-            preview_key = f"previews/{document_id}/page_{page_number}.png"
-            preview_data = download_from_s3(settings.s3_bucket_thumbnails, preview_key)
-            return Response(content=preview_data, media_type="image/png")
-        except:
-            pass
+        # Try high-res preview from SOS (WebP, then legacy PNG)
+        for ext, media_type in (("webp", "image/webp"), ("png", "image/png")):
+            try:
+                preview_key = f"previews/{document_id}/page_{page_number}.{ext}"
+                preview_data = download_from_s3(
+                    settings.s3_bucket_thumbnails, preview_key
+                )
+                return Response(content=preview_data, media_type=media_type)
+            except:
+                pass
+
+        # Previews are not pre-rendered when SOS is available; build and cache
+        # this page's preview on first request once processing has finished
+        if document.status == "ready":
+            try:
+                from starlette.concurrency import run_in_threadpool
+
+                from .s3_client import get_s3_client
+
+                get_s3_client()  # raises if SOS is not configured
+                preview_data = await run_in_threadpool(
+                    render_page_preview, settings, document, page_number
+                )
+                if preview_data is not None:
+                    return Response(content=preview_data, media_type="image/webp")
+            except Exception as e:
+                print(
+                    f"DEBUG: On-demand preview failed for document {document_id}: {e}"
+                )
 
         # Try thumbnail from SOS
         try:
@@ -1105,13 +1178,14 @@ async def get_document_thumbnail(
         pass
 
     # Fallback to local files (shared volume)
-    preview_path = get_local_processed_path(
-        f"previews/{document_id}/page_{page_number}.png"
-    )
-    if os.path.exists(preview_path):
-        with open(preview_path, "rb") as f:
-            preview_data = f.read()
-        return Response(content=preview_data, media_type="image/png")
+    for ext, media_type in (("webp", "image/webp"), ("png", "image/png")):
+        preview_path = get_local_processed_path(
+            f"previews/{document_id}/page_{page_number}.{ext}"
+        )
+        if os.path.exists(preview_path):
+            with open(preview_path, "rb") as f:
+                preview_data = f.read()
+            return Response(content=preview_data, media_type=media_type)
 
     local_path = get_local_processed_path(
         f"thumbnails/{document_id}/page_{page_number}.webp"
@@ -1941,8 +2015,10 @@ async def reprocess_document(
     if not _user_can_edit_document(db, document_id, current_user):
         raise HTTPException(status_code=403, detail="Permission denied")
 
-    # Clear existing jobs for this document
+    # Clear existing jobs for this document and leave the terminal state so the
+    # new jobs can move it to ready/error again
     db.query(ProcessingJob).filter(ProcessingJob.document_id == document_id).delete()
+    document.status = "new"
     db.commit()
 
     # Enqueue new processing jobs
@@ -1,10 +1,43 @@
+import io
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Iterable, Tuple
+
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from .config import get_settings
 
+# Objects above the threshold are sent as parallel multipart uploads
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=5 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024
+)
+
+# In-memory payloads above this size (e.g. large converted PDFs) are uploaded
+# as parallel 8 MB parts instead of a single PUT
+MULTIPART_UPLOAD_THRESHOLD = 16 * 1024 * 1024
+LARGE_OBJECT_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_UPLOAD_THRESHOLD,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+)
+
+
+_client = None
+_client_key = None
+_client_lock = threading.Lock()
+
 
 def get_s3_client():
+    """Return the process-wide S3/SOS client, creating it on first use.
+
+    boto3 clients are thread-safe, so one client and its connection pool are
+    shared by every caller instead of paying a TLS handshake per request.
+    """
+    global _client, _client_key
     settings = get_settings()
     # Require explicit Exoscale SOS configuration for safety in tests/local dev
     if (
@@ -14,13 +47,37 @@ def get_s3_client():
     ):
         raise ValueError("S3 credentials not configured")
 
-    return boto3.client(
-        "s3",
-        endpoint_url=settings.s3_endpoint,
-        region_name=settings.s3_region,
-        aws_access_key_id=settings.s3_access_key,
-        aws_secret_access_key=settings.s3_secret_key,
+    key = (
+        settings.s3_endpoint,
+        settings.s3_region,
+        settings.s3_access_key,
+        settings.s3_secret_key,
     )
+    with _client_lock:
+        if _client is None or _client_key != key:
+            _client = boto3.client(
+                "s3",
+                endpoint_url=settings.s3_endpoint,
+                region_name=settings.s3_region,
+                aws_access_key_id=settings.s3_access_key,
+                aws_secret_access_key=settings.s3_secret_key,
+                config=Config(
+                    # Room for the parallel PUTs issued by upload_many_to_s3
+                    max_pool_connections=64,
+                    retries={"max_attempts": 5, "mode": "adaptive"},
+                    tcp_keepalive=True,
+                ),
+            )
+            _client_key = key
+        return _client
+
+
+def reset_s3_client():
+    """Drop the shared client so the next call builds a fresh connection pool"""
+    global _client, _client_key
+    with _client_lock:
+        _client = None
+        _client_key = None
 
 
 def generate_presigned_upload(filename: str, content_type: str, size: int) -> dict:
@@ -52,10 +109,71 @@ def generate_presigned_upload(filename: str, content_type: str, size: int) -> di
 
 def upload_to_s3(
     bucket: str, key: str, data: bytes, content_type: str = "application/octet-stream"
+) -> str | None:
+    """Upload file to S3/SOS and return the stored object's ETag"""
+    s3_client = get_s3_client()
+    if len(data) > MULTIPART_UPLOAD_THRESHOLD:
+        s3_client.upload_fileobj(
+            io.BytesIO(data),
+            bucket,
+            key,
+            ExtraArgs={"ContentType": content_type},
+            Config=LARGE_OBJECT_TRANSFER_CONFIG,
+        )
+        # upload_fileobj doesn't surface the ETag of the completed object
+        return s3_client.head_object(Bucket=bucket, Key=key).get("ETag")
+
+    response = s3_client.put_object(
+        Bucket=bucket, Key=key, Body=data, ContentType=content_type
+    )
+    return response.get("ETag")
+
+
+def upload_many_to_s3(
+    bucket: str,
+    objects: Iterable[Tuple[str, bytes]],
+    content_type: str = "application/octet-stream",
+    max_workers: int = 16,
+) -> int:
+    """Upload many small (key, data) objects in parallel over one client.
+
+    Small-object PUTs are latency-bound, so a bounded pool of concurrent requests
+    sharing one connection pool is much faster than uploading them one by one.
+    Returns the number of objects uploaded; the first failure is re-raised.
+    """
+    s3_client = get_s3_client()
+
+    def _upload_one(item: Tuple[str, bytes]) -> None:
+        key, data = item
+        s3_client.put_object(
+            Bucket=bucket, Key=key, Body=data, ContentType=content_type
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return sum(1 for _ in executor.map(_upload_one, objects))
+
+
+def upload_fileobj_to_s3(
+    bucket: str,
+    key: str,
+    fileobj: BinaryIO,
+    content_type: str = "application/octet-stream",
+    content_encoding: str | None = None,
 ):
-    """Upload file to S3/SOS"""
+    """Stream a file-like object to S3/SOS, using multipart upload when large"""
     s3_client = get_s3_client()
-    s3_client.put_object(Bucket=bucket, Key=key, Body=data, ContentType=content_type)
+    extra_args = {"ContentType": content_type}
+    if content_encoding:
+        extra_args["ContentEncoding"] = content_encoding
+    s3_client.upload_fileobj(
+        fileobj, bucket, key, ExtraArgs=extra_args, Config=TRANSFER_CONFIG
+    )
+
+
+def get_s3_etag(bucket: str, key: str) -> str:
+    """Return the ETag of an S3/SOS object (raises ClientError if missing)"""
+    s3_client = get_s3_client()
+    return s3_client.head_object(Bucket=bucket, Key=key)["ETag"]
 
 
 def download_from_s3(bucket: str, key: str) -> bytes:
@@ -63,3 +181,21 @@ def download_from_s3(bucket: str, key: str) -> bytes:
     s3_client = get_s3_client()
     response = s3_client.get_object(Bucket=bucket, Key=key)
     return response["Body"].read()
+
+
+def download_to_fileobj_from_s3(
+    bucket: str, key: str, fileobj: BinaryIO, min_size: int = 0
+) -> int:
+    """Stream an S3/SOS object into ``fileobj`` in 1 MB chunks.
+
+    Returns the number of bytes written, or 0 (writing nothing) when the
+    object is not larger than ``min_size``.
+    """
+    s3_client = get_s3_client()
+    response = s3_client.get_object(Bucket=bucket, Key=key)
+    size = response["ContentLength"]
+    if size <= min_size:
+        response["Body"].close()
+        return 0
+    shutil.copyfileobj(response["Body"], fileobj, length=1 << 20)
+    return size
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class TokenResponse(BaseModel):
@@ -83,6 +83,11 @@ class DocumentCreate(BaseModel):
     filing_date: datetime | None = None
 
 
+class DocumentBulkCreate(BaseModel):
+    # Bounded so one request can't insert and enqueue an unlimited batch
+    documents: list[DocumentCreate] = Field(..., min_length=1, max_length=100)
+
+
 class DocumentOut(BaseModel):
     id: int
     title: str
@@ -1,3 +1,20 @@
+import glob
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime
 
 from celery import current_task
@@ -9,15 +26,36 @@ from .conversion import convert_document_to_pdf
 from .db import SessionLocal
 from .models import Document, ProcessingJob, DocumentText
 from .processing import (
+    FAST_OCR_CONFIG,
     extract_text_from_image,
     extract_text_from_pdf,
+    generate_preview_image,
     generate_single_page_image,
     generate_thumbnail,
     get_document_info,
     rasterize_image,
+    rasterize_pdf_page,
     rasterize_pdf_pages,
 )
-from .s3_client import download_from_s3, upload_to_s3, get_s3_client
+from .s3_client import (
+    download_from_s3,
+    download_to_fileobj_from_s3,
+    get_s3_client,
+    get_s3_etag,
+    upload_fileobj_to_s3,
+    upload_to_s3,
+)
+
+try:  # Optional: orjson serializes straight to bytes in one C pass
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Tesseract's OpenMP threads oversubscribe the CPU when several worker processes
+# OCR at once; each worker process already gets its own core.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
 
 def get_local_processed_path(subdir: str) -> str:
@@ -33,6 +71,11 @@ def get_local_processed_path(subdir: str) -> str:
         return os.path.normpath(local_processed)
 
 
+def converted_pdf_key(document_id: int) -> str:
+    """Deterministic S3 key (in the originals bucket) for a document's converted PDF"""
+    return f"documents/{document_id}/converted.pdf"
+
+
 def get_db_session() -> Session:
     """Get database session for Celery tasks"""
     return SessionLocal()
@@ -40,6 +83,14 @@ def get_db_session() -> Session:
 
 def _update_document_status_if_complete(document_id: int, db: Session):
     """Check if all processing jobs are complete and update document status"""
+    # Cheap short-circuit: several tasks often finish at once for the same document.
+    # "error" is not final: retried jobs must still be able to move it to "ready"
+    doc_status = (
+        db.query(Document.status).filter(Document.id == document_id).scalar()
+    )
+    if doc_status is None or doc_status == "ready":
+        return
+
     jobs = (
         db.query(ProcessingJob).filter(ProcessingJob.document_id == document_id).all()
     )
@@ -57,19 +108,127 @@ def _update_document_status_if_complete(document_id: int, db: Session):
     if has_failed:
         if document.status != "error":
             document.status = "error"
-            print(
+            logger.info(
                 f"Updated document {document_id} status to 'error' due to failed jobs"
             )
             db.commit()
     elif all_completed:
         if document.status != "ready":
             document.status = "ready"
-            print(
+            logger.info(
                 f"Updated document {document_id} status to 'ready' - all jobs completed"
             )
             db.commit()
 
 
+# Per-page progress is persisted at most every 5% or every 2 seconds
+PROGRESS_COMMIT_STEP = 5
+PROGRESS_COMMIT_INTERVAL = 2.0
+
+
+def _progress_commit_due(
+    progress: int, last_commit_pct: int, last_commit_ts: float
+) -> bool:
+    """Whether a per-page progress update is worth a DB commit"""
+    return (
+        progress - last_commit_pct >= PROGRESS_COMMIT_STEP
+        or time.monotonic() - last_commit_ts > PROGRESS_COMMIT_INTERVAL
+    )
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(items, maxsize: int = 2):
+    """Iterate ``items`` on a background thread through a bounded queue.
+
+    Rasterizing the next pages then overlaps with encoding/uploading on the page
+    pool and with the task's DB updates. Producer exceptions are re-raised here.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in items:
+                if not _put(item):
+                    return
+            _put(_PREFETCH_DONE)
+        except BaseException as e:
+            _put(e)
+
+    producer = threading.Thread(target=_produce, name="page-prefetch", daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _PREFETCH_DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblock the producer if the consumer stopped early
+        stop.set()
+        producer.join()
+
+
+def _iter_page_results(worker, pages, max_workers: int):
+    """Run ``worker(page_num, page_image)`` for every page on a thread pool.
+
+    Yields each page's result as it completes (not in page order). Threads rather
+    than processes: Celery prefork children are daemonic and cannot fork a
+    ProcessPool, and Pillow encoding and the tesseract subprocess release the GIL.
+    ``pages`` is rasterized lazily on a prefetch thread with a bounded number of
+    pages in flight, so only a few rasterized pages are held in memory at a time.
+    """
+    max_in_flight = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = set()
+        for page_num, page_image in _prefetch(pages):
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            pending.add(executor.submit(worker, page_num, page_image))
+            del page_image
+        for future in as_completed(pending):
+            yield future.result()
+
+
+def _dumps_json(obj) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _gzip_ocr_result(document_id: int, pages: list[dict]) -> io.BytesIO:
+    """Serialize OCR results as gzip-compressed JSON, one page at a time.
+
+    Avoids materializing the whole document's JSON as a str and again as bytes.
+    """
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb") as gz:
+        gz.write(f'{{"document_id": {document_id}, "pages": ['.encode())
+        for i, page in enumerate(pages):
+            if i:
+                gz.write(b", ")
+            gz.write(_dumps_json(page))
+        gz.write(f'], "total_pages": {len(pages)}}}'.encode())
+    buf.seek(0)
+    return buf
+
+
 def _load_processing_file_bytes(settings, document: Document) -> bytes:
     """Load the appropriate file for processing (always prefer converted PDF if available)."""
 
@@ -86,15 +245,17 @@ def _load_processing_file_bytes(settings, document: Document) -> bytes:
             contents = resp.get("Contents", [])
             pdf_keys = [obj["Key"] for obj in contents if obj["Key"].lower().endswith(".pdf")]
             if pdf_keys:
-                # Prefer most recent
+                # Prefer the deterministic key, then the most recent legacy name
                 pdf_keys.sort()
                 key = pdf_keys[-1]
+                if converted_pdf_key(document.id) in pdf_keys:
+                    key = converted_pdf_key(document.id)
                 data = download_from_s3(settings.s3_bucket_originals, key)
                 if len(data) > 1000:
-                    print(f"Using converted PDF from S3: {key} ({len(data)} bytes)")
+                    logger.info(f"Using converted PDF from S3: {key} ({len(data)} bytes)")
                     return data
         except Exception as e:
-            print(f"S3 lookup for converted PDF failed or not found: {e}")
+            logger.debug(f"S3 lookup for converted PDF failed or not found: {e}")
 
         # Generate possible converted PDF names
         base_name = (
@@ -122,95 +283,174 @@ def _load_processing_file_bytes(settings, document: Document) -> bytes:
                 with open(path, "rb") as f:
                     file_data = f.read()
                     if len(file_data) > 1000:  # Ensure it's not a tiny placeholder
-                        print(f"Using converted PDF: {path} ({len(file_data)} bytes)")
+                        logger.info(f"Using converted PDF: {path} ({len(file_data)} bytes)")
                         return file_data
                     else:
-                        print(
+                        logger.debug(
                             f"Skipping small converted PDF: {path} ({len(file_data)} bytes)"
                         )
             except FileNotFoundError:
                 continue
 
         # If no converted PDF found, try to convert on-the-fly
-        print(f"No converted PDF found for {document.title}, attempting conversion...")
+        logger.info(f"No converted PDF found for {document.title}, attempting conversion...")
         try:
             from .conversion import convert_document_to_pdf
 
             original_data = _load_original_file_bytes(settings, document)
-            print(f"Loaded original file: {len(original_data)} bytes")
+            logger.debug(f"Loaded original file: {len(original_data)} bytes")
 
             if len(original_data) > 1000:  # Ensure we have real content
                 pdf_data, pdf_filename = convert_document_to_pdf(
                     original_data, document.title
                 )
-                print(f"Converted to PDF: {len(pdf_data)} bytes")
+                logger.info(f"Converted to PDF: {len(pdf_data)} bytes")
                 return pdf_data
             else:
-                print("Original file too small, using as-is")
+                logger.warning("Original file too small, using as-is")
         except Exception as e:
-            print(f"On-the-fly conversion failed: {e}")
+            logger.warning(f"On-the-fly conversion failed: {e}")
 
         # If conversion fails, fall back to original loading
-        print(
-            f"Warning: Conversion failed for {document.title}, using original file loading"
+        logger.warning(
+            f"Conversion failed for {document.title}, using original file loading"
         )
 
     # Use original file loading for PDFs and as fallback
     return _load_original_file_bytes(settings, document)
 
 
+def _original_cache_prefix(settings, key: str) -> str:
+    digest = hashlib.sha256(key.encode()).hexdigest()
+    return os.path.join(settings.original_cache_dir, digest)
+
+
+def _original_cache_path(settings, key: str, etag: str) -> str:
+    """Cache entry for one version of an S3 object: its key digest plus ETag.
+
+    Document ids are reused (TRUNCATE ... RESTART IDENTITY, SQLite rowids), so
+    entries are never keyed by id; a replaced object gets a new ETag and misses.
+    """
+    version = etag.strip('"')
+    return f"{_original_cache_prefix(settings, key)}.{version}.bin"
+
+
+def _fresh_original_cache_path(settings, key: str, etag: str) -> str | None:
+    """Return the cache path for an object version if present and fresh"""
+    path = _original_cache_path(settings, key, etag)
+    try:
+        if time.time() - os.path.getmtime(path) > settings.original_cache_ttl:
+            return None
+        os.utime(path)  # Mark as recently used for LRU eviction
+        return path
+    except OSError:
+        return None
+
+
+def _read_original_cache(settings, key: str, etag: str) -> bytes | None:
+    """Return cached bytes for an object version if present and fresh"""
+    path = _fresh_original_cache_path(settings, key, etag)
+    if path is None:
+        return None
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_original_cache(settings, key: str, etag: str, data: bytes):
+    """Atomically cache original bytes, then evict least recently used entries"""
+    cache_dir = settings.original_cache_dir
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        path = _original_cache_path(settings, key, etag)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        entries = []
+        for name in os.listdir(cache_dir):
+            if name.endswith(".bin"):
+                stat = os.stat(os.path.join(cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= settings.original_cache_max_bytes:
+                break
+            os.remove(os.path.join(cache_dir, name))
+            total -= size
+    except OSError as e:
+        logger.warning(f"Failed to cache original file {key}: {e}")
+
+
+def _evict_original_cache(settings, document: Document):
+    """Drop every cached version of a document's possible original objects"""
+    for filename in _possible_original_filenames(document):
+        prefix = _original_cache_prefix(settings, f"uploads/{filename}")
+        for path in glob.glob(f"{glob.escape(prefix)}.*.bin"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _clear_original_cache(settings):
+    """Drop the whole original-file cache"""
+    for path in glob.glob(os.path.join(settings.original_cache_dir, "*.bin")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
 def _load_original_file_bytes(settings, document: Document) -> bytes:
     """Best-effort loader for original uploaded file bytes.
 
     Load order:
-    1) S3 bucket `settings.s3_bucket_originals` at key `uploads/{document.title}`
+    1) S3 bucket `settings.s3_bucket_originals` at key `uploads/{document.title}`,
+       served from the local scratch cache when the object's ETag matches a
+       previous download
     2) Local uploads within project layout used by API/worker: `/srv/backend/uploads/{filename}`
     3) Alternate local paths that may be used in dev: `/srv/uploads/{filename}`, `uploads/{filename}`
     4) Try with different extensions if title has been changed during conversion
     5) As a last resort, synthesize a simple one-page PDF indicating a placeholder
     """
 
-    # Generate possible filenames - both current title and possible original extensions
-    possible_filenames = [document.title]
-
-    # If document title ends with .pdf but might have been converted, try common office extensions
-    if document.title.lower().endswith(".pdf"):
-        base_name = document.title.rsplit(".", 1)[0]
-        # Try common document extensions
-        for ext in [".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".txt"]:
-            possible_filenames.append(f"{base_name}{ext}")
+    possible_filenames = _possible_original_filenames(document)
 
-    # 1) Try S3 with all possible filenames
+    # 1) Try S3 with all possible filenames; a HEAD decides whether the cached
+    # copy is still this object's current version
     for filename in possible_filenames:
         original_key = f"uploads/{filename}"
         try:
+            etag = get_s3_etag(settings.s3_bucket_originals, original_key)
+            file_data = _read_original_cache(settings, original_key, etag)
+            if file_data is not None:
+                logger.debug(f"Found original file in cache ({len(file_data)} bytes)")
+                return file_data
+
             file_data = download_from_s3(settings.s3_bucket_originals, original_key)
             if len(file_data) > 100:  # Ensure we got real content
-                print(
+                logger.debug(
                     f"Found original file in S3: {original_key} ({len(file_data)} bytes)"
                 )
+                _write_original_cache(settings, original_key, etag, file_data)
                 return file_data
         except Exception:
             continue
 
     # 2) and 3) Try local filesystem variants with all possible filenames
-    import os
-
     for filename in possible_filenames:
-        candidate_paths = [
-            f"/app/uploads/{filename}",  # shared volume path
-            f"/srv/backend/uploads/{filename}",  # container path when running `cd backend`
-            f"/srv/uploads/{filename}",  # alternate mount path
-            f"uploads/{filename}",  # relative path in dev
-        ]
-        for path in candidate_paths:
+        for path in _local_original_paths(filename):
             if os.path.exists(path):
                 try:
                     file_size = os.path.getsize(path)
                     if file_size > 100:  # Ensure it's not empty
                         with open(path, "rb") as f:
                             file_data = f.read()
-                        print(
+                        logger.debug(
                             f"Found original file locally: {path} ({len(file_data)} bytes)"
                         )
                         return file_data
@@ -218,6 +458,32 @@ def _load_original_file_bytes(settings, document: Document) -> bytes:
                     continue
 
     # 4) Last resort: create a minimal placeholder PDF
+    return _missing_original_placeholder(document)
+
+
+def _possible_original_filenames(document: Document) -> list[str]:
+    """Current title plus the office names a converted document may have had"""
+    possible_filenames = [document.title]
+
+    # If document title ends with .pdf but might have been converted, try common office extensions
+    if document.title.lower().endswith(".pdf"):
+        base_name = document.title.rsplit(".", 1)[0]
+        # Try common document extensions
+        for ext in [".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".txt"]:
+            possible_filenames.append(f"{base_name}{ext}")
+    return possible_filenames
+
+
+def _local_original_paths(filename: str) -> list[str]:
+    return [
+        f"/app/uploads/{filename}",  # shared volume path
+        f"/srv/backend/uploads/{filename}",  # container path when running `cd backend`
+        f"/srv/uploads/{filename}",  # alternate mount path
+        f"uploads/{filename}",  # relative path in dev
+    ]
+
+
+def _missing_original_placeholder(document: Document) -> bytes:
     import fitz
 
     doc = fitz.open()
@@ -230,6 +496,257 @@ def _load_original_file_bytes(settings, document: Document) -> bytes:
     return data
 
 
+def _stream_original_file_to(settings, document: Document, dest) -> int:
+    """Write the original upload into the binary file object ``dest``.
+
+    Same lookup order as ``_load_original_file_bytes``, but the file is copied
+    in 1 MB chunks so it is never held in memory whole. S3 downloads are not
+    added to the scratch cache. Returns the number of bytes written.
+    """
+    possible_filenames = _possible_original_filenames(document)
+
+    def _copy_file(path: str) -> int:
+        with open(path, "rb") as src:
+            shutil.copyfileobj(src, dest, length=1 << 20)
+        return os.path.getsize(path)
+
+    for filename in possible_filenames:
+        original_key = f"uploads/{filename}"
+        try:
+            etag = get_s3_etag(settings.s3_bucket_originals, original_key)
+            cache_path = _fresh_original_cache_path(settings, original_key, etag)
+            if cache_path is not None:
+                return _copy_file(cache_path)
+
+            written = download_to_fileobj_from_s3(
+                settings.s3_bucket_originals, original_key, dest, min_size=100
+            )
+            if written:
+                return written
+        except Exception:
+            dest.seek(0)
+            dest.truncate()
+
+    for filename in possible_filenames:
+        for path in _local_original_paths(filename):
+            try:
+                if os.path.getsize(path) > 100:
+                    return _copy_file(path)
+            except OSError:
+                dest.seek(0)
+                dest.truncate()
+
+    data = _missing_original_placeholder(document)
+    dest.write(data)
+    return len(data)
+
+
+def _placeholder_pdf(message: str) -> bytes:
+    """Synthesize a minimal one-page PDF so the pipeline can keep going"""
+    import fitz
+
+    doc_new = fitz.open()
+    page = doc_new.new_page()
+    page.insert_text((72, 72), message)
+    out = doc_new.tobytes()
+    doc_new.close()
+    return out
+
+
+def _ensure_pdf_bytes(settings, document: Document, data: bytes) -> bytes:
+    """Make sure processing operates on valid PDF bytes.
+
+    If the bytes are not a valid PDF stream (e.g. office doc bytes), attempt inline
+    conversion of the original. As a last resort, synthesize a placeholder PDF to
+    avoid 'Failed to open stream' errors further down the pipeline.
+    """
+    import fitz
+
+    try:
+        doc_try = fitz.open(stream=data, filetype="pdf")
+        doc_try.close()
+        return data
+    except Exception:
+        # Try converting original bytes inline
+        try:
+            original_bytes = _load_original_file_bytes(settings, document)
+            pdf_bytes, _ = convert_document_to_pdf(original_bytes, document.title)
+            return pdf_bytes
+        except Exception as conv_err:
+            logger.warning(
+                f"Inline conversion failed for document {document.id}, "
+                f"using placeholder PDF: {conv_err}"
+            )
+            return _placeholder_pdf(f"Placeholder for: {document.title}")
+
+
+def _rasterize_document(
+    document: Document, file_data: bytes, dpi: int, grayscale: bool = False
+):
+    """Rasterize pages - all documents should be PDFs after conversion"""
+    # Only use image rasterization for formats that definitely can't be converted to PDF
+    if document.title.lower().endswith(
+        (".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".csv", ".txt")
+    ):
+        return rasterize_pdf_pages(file_data, dpi=dpi, grayscale=grayscale)
+    # For pure image files that weren't converted, try PDF first (in case they were converted)
+    try:
+        return rasterize_pdf_pages(file_data, dpi=dpi, grayscale=grayscale)
+    except Exception:
+        # Fallback to image processing
+        return rasterize_image(file_data, dpi=dpi)
+
+
+def _store_page_image(settings, document_id: int, page_num: int, page_image: bytes):
+    """Generate the single 300 DPI viewer image for a page and store it"""
+    # Generate single high-quality image instead of tiles
+    single_image_data = generate_single_page_image(page_image, dpi=300)
+
+    # Upload single page image to S3 or store locally
+    page_key = f"pages/{document_id}/page_{page_num}.webp"
+    try:
+        upload_to_s3(settings.s3_bucket_tiles, page_key, single_image_data, "image/webp")
+    except Exception as e:
+        # Store locally if S3 is not available
+        local_dir = get_local_processed_path(f"pages/{document_id}")
+        os.makedirs(local_dir, exist_ok=True)
+        local_path = f"{local_dir}/page_{page_num}.webp"
+        with open(local_path, "wb") as f:
+            f.write(single_image_data)
+        logger.warning(
+            f"Failed to upload page image to SOS, stored locally at {local_path}: {e}"
+        )
+
+
+def _store_thumbnail(settings, document_id: int, page_num: int, page_image: bytes):
+    """Generate and store a page thumbnail.
+
+    Full-resolution previews are only written to local disk when S3 is not
+    available; otherwise render_page_preview builds them on first request.
+    """
+    thumbnail = generate_thumbnail(page_image, max_size=(200, 300))
+
+    # Upload thumbnail to S3 or store locally
+    thumb_key = f"thumbnails/{document_id}/page_{page_num}.webp"
+    try:
+        upload_to_s3(settings.s3_bucket_thumbnails, thumb_key, thumbnail, "image/webp")
+        return
+    except Exception as e:
+        # Store locally if S3 is not available
+        local_dir = get_local_processed_path(f"thumbnails/{document_id}")
+        os.makedirs(local_dir, exist_ok=True)
+        local_path = f"{local_dir}/page_{page_num}.webp"
+        with open(local_path, "wb") as f:
+            f.write(thumbnail)
+        logger.warning(
+            f"Failed to upload thumbnail to SOS, stored locally at {local_path}: {e}"
+        )
+
+    # Also persist a full-resolution preview (WebP) for 300 DPI viewing
+    try:
+        preview_dir = get_local_processed_path(f"previews/{document_id}")
+        os.makedirs(preview_dir, exist_ok=True)
+        preview_path = f"{preview_dir}/page_{page_num}.webp"
+        with open(preview_path, "wb") as f:
+            f.write(generate_preview_image(page_image))
+    except Exception as e:
+        logger.warning(f"Failed to store preview image: {e}")
+
+
+def render_page_preview(settings, document: Document, page_num: int) -> bytes | None:
+    """Render a full-resolution page preview on demand and cache it in S3.
+
+    Returns None if the page does not exist.
+    """
+    file_data = _load_processing_file_bytes(settings, document)
+    try:
+        page_image = rasterize_pdf_page(
+            _ensure_pdf_bytes(settings, document, file_data), page_num, dpi=300
+        )
+    except Exception:
+        # Pure image uploads that were never converted to PDF
+        images = dict(rasterize_image(file_data))
+        page_image = images.get(page_num)
+    if page_image is None:
+        return None
+
+    preview = generate_preview_image(page_image)
+    preview_key = f"previews/{document.id}/page_{page_num}.webp"
+    try:
+        upload_to_s3(settings.s3_bucket_thumbnails, preview_key, preview, "image/webp")
+    except Exception as e:
+        logger.warning(f"Failed to cache preview {preview_key} in SOS: {e}")
+    return preview
+
+
+def _ocr_page(page_num: int, page_image: bytes) -> dict:
+    """OCR one rasterized page; errors are recorded in the page text"""
+    try:
+        text = extract_text_from_image(
+            page_image, language="eng", config=FAST_OCR_CONFIG
+        )
+        return {"page": page_num, "text": text}
+    except Exception as e:
+        logger.warning(f"OCR failed for page {page_num}: {e}")
+        return {"page": page_num, "text": f"[OCR Error: {str(e)}]"}
+
+
+def _extract_text_layer(file_data: bytes) -> tuple[list[dict], bool]:
+    """Extract the PDF text layer and decide whether OCR is still needed.
+
+    Returns ``(pages, needs_ocr)``; OCR is needed when there is no usable text
+    layer or its text is too short.
+    """
+    extracted_text = []
+    used_pdf_layer = False
+    try:
+        pdf_text_pages = extract_text_from_pdf(file_data)
+        # Only accept PDF text layer if it contains any real text
+        if pdf_text_pages and any((t or "").strip() for _, t in pdf_text_pages):
+            for page_num, text in pdf_text_pages:
+                extracted_text.append({"page": page_num, "text": text})
+            used_pdf_layer = True
+    except Exception as e:
+        logger.warning(f"PDF text extraction error: {e}")
+
+    needs_ocr = (not used_pdf_layer) or (
+        sum(len((p.get("text") or "").strip()) for p in extracted_text) < 100
+    )
+    return extracted_text, needs_ocr
+
+
+def _store_document_text(
+    settings, db: Session, document_id: int, extracted_text: list[dict]
+):
+    """Persist combined text to the DB for search and upload per-page JSON to S3"""
+    try:
+        combined_text = "\n".join(p["text"] for p in extracted_text if p.get("text"))
+        existing = (
+            db.query(DocumentText).filter(DocumentText.document_id == document_id).first()
+        )
+        if existing:
+            existing.text = combined_text
+            existing.updated_at = datetime.utcnow()
+        else:
+            db.add(DocumentText(document_id=document_id, text=combined_text))
+        db.commit()
+    except Exception as e:
+        logger.error(f"Failed to persist OCR text for document {document_id}: {e}")
+
+    # Upload OCR results to S3 (gzip, multipart for large documents)
+    ocr_key = f"ocr/{document_id}/text.json"
+    try:
+        upload_fileobj_to_s3(
+            settings.s3_bucket_ocr,
+            ocr_key,
+            _gzip_ocr_result(document_id, extracted_text),
+            "application/json",
+            content_encoding="gzip",
+        )
+    except Exception as e:
+        logger.warning(f"Failed to upload OCR results to SOS: {e}")
+
+
 @celery_app.task(bind=True)
 def process_document_tiling(self, document_id: int, job_id: int):
     """Generate tiles for a document"""
@@ -241,7 +758,7 @@ def process_document_tiling(self, document_id: int, job_id: int):
         # Update job status
         job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
-            print(f"WARN: Job {job_id} not found; marking gracefully and returning")
+            logger.warning(f"Job {job_id} not found; marking gracefully and returning")
             return {"status": "skipped", "reason": "job_missing"}
 
         document = db.query(Document).filter(Document.id == document_id).first()
@@ -255,82 +772,40 @@ def process_document_tiling(self, document_id: int, job_id: int):
 
         # Load appropriate file bytes (converted PDF if available, original otherwise)
         file_data = _load_processing_file_bytes(settings, document)
-
-        # Ensure we operate on valid PDF bytes to avoid 'Failed to open stream'
-        def _ensure_pdf_bytes(data: bytes) -> bytes:
-            try:
-                import fitz
-                doc_try = fitz.open(stream=data, filetype="pdf")
-                doc_try.close()
-                return data
-            except Exception:
-                # Try converting original bytes inline
-                try:
-                    original_bytes = _load_original_file_bytes(settings, document)
-                    pdf_bytes, _ = convert_document_to_pdf(original_bytes, document.title)
-                    return pdf_bytes
-                except Exception as conv_err:
-                    print(f"Tiling inline conversion failed, using placeholder PDF: {conv_err}")
-                    import fitz
-                    doc_new = fitz.open()
-                    page = doc_new.new_page()
-                    page.insert_text((72, 72), f"Placeholder for: {document.title}")
-                    out = doc_new.tobytes()
-                    doc_new.close()
-                    return out
-
-        file_data = _ensure_pdf_bytes(file_data)
+        file_data = _ensure_pdf_bytes(settings, document, file_data)
 
         job.progress = 20
         db.commit()
         self.update_state(state="PROGRESS", meta={"progress": 20})
 
-        # Rasterize pages - all documents should be PDFs after conversion
-        # Only use image rasterization for formats that definitely can't be converted to PDF
-        if document.title.lower().endswith(
-            (".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".csv", ".txt")
-        ):
-            pages = rasterize_pdf_pages(file_data, dpi=300)
-        else:
-            # For pure image files that weren't converted, try PDF first (in case they were converted)
-            try:
-                pages = rasterize_pdf_pages(file_data, dpi=300)
-            except Exception:
-                # Fallback to image processing
-                pages = rasterize_image(file_data, dpi=300)
+        pages = _rasterize_document(document, file_data, dpi=300)
 
         job.progress = 50
         db.commit()
         self.update_state(state="PROGRESS", meta={"progress": 50})
 
-        # Generate single 300 DPI image for each page
-        total_pages = len(pages) if pages is not None else 0
-        for i, (page_num, page_image) in enumerate(pages):
-            # Generate single high-quality image instead of tiles
-            single_image_data = generate_single_page_image(page_image, dpi=300)
+        def _process_page(page_num: int, page_image: bytes) -> int:
+            _store_page_image(settings, document_id, page_num, page_image)
+            return page_num
 
-            # Upload single page image to S3 or store locally
-            page_key = f"pages/{document_id}/page_{page_num}.webp"
-            try:
-                upload_to_s3(
-                    settings.s3_bucket_tiles, page_key, single_image_data, "image/webp"
+        # Generate single 300 DPI image for each page; DB writes stay on this thread
+        total_pages = len(pages) if pages is not None else 0
+        page_results = _iter_page_results(
+            _process_page, pages, settings.page_workers
+        )
+        last_commit_pct, last_commit_ts = job.progress, time.monotonic()
+        for i, page_num in enumerate(page_results):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Document {document_id}: page image {page_num + 1}/{total_pages} done"
                 )
-            except Exception as e:
-                # Store locally if S3 is not available
-                import os
-
-                local_dir = get_local_processed_path(f"pages/{document_id}")
-                os.makedirs(local_dir, exist_ok=True)
-                local_path = f"{local_dir}/page_{page_num}.webp"
-                with open(local_path, "wb") as f:
-                    f.write(single_image_data)
-                print(f"Failed to upload page image to SOS: {e}")
-                print(f"Stored page image locally: {local_path}")
 
             # Update progress
             progress = 50 + (40 * (i + 1) // max(total_pages, 1))
             job.progress = progress
-            db.commit()
+            if _progress_commit_due(progress, last_commit_pct, last_commit_ts):
+                db.commit()
+                last_commit_pct, last_commit_ts = progress, time.monotonic()
             self.update_state(state="PROGRESS", meta={"progress": progress})
 
         # Mark as completed
@@ -358,7 +833,7 @@ def process_document_tiling(self, document_id: int, job_id: int):
         
         # Don't re-raise for file corruption errors - let other tasks continue
         if "Failed to open stream" in str(e) or "FileDataError" in str(e):
-            print(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
+            logger.warning(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
             return {"status": "failed", "error": str(e)}
         
         raise
@@ -377,7 +852,7 @@ def process_document_thumbnails(self, document_id: int, job_id: int):
         # Update job status
         job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
-            print(f"WARN: Job {job_id} not found; marking gracefully and returning")
+            logger.warning(f"Job {job_id} not found; marking gracefully and returning")
             return {"status": "skipped", "reason": "job_missing"}
 
         document = db.query(Document).filter(Document.id == document_id).first()
@@ -391,93 +866,41 @@ def process_document_thumbnails(self, document_id: int, job_id: int):
 
         # Load appropriate file bytes (converted PDF if available, original otherwise)
         file_data = _load_processing_file_bytes(settings, document)
-
-        # Ensure we operate on valid PDF bytes to avoid 'Failed to open stream'
-        def _ensure_pdf_bytes(data: bytes) -> bytes:
-            try:
-                import fitz
-                doc_try = fitz.open(stream=data, filetype="pdf")
-                doc_try.close()
-                return data
-            except Exception:
-                # Try converting original bytes inline
-                try:
-                    original_bytes = _load_original_file_bytes(settings, document)
-                    pdf_bytes, _ = convert_document_to_pdf(original_bytes, document.title)
-                    return pdf_bytes
-                except Exception as conv_err:
-                    print(f"Thumbnails inline conversion failed, using placeholder PDF: {conv_err}")
-                    import fitz
-                    doc_new = fitz.open()
-                    page = doc_new.new_page()
-                    page.insert_text((72, 72), f"Placeholder for: {document.title}")
-                    out = doc_new.tobytes()
-                    doc_new.close()
-                    return out
-
-        file_data = _ensure_pdf_bytes(file_data)
+        file_data = _ensure_pdf_bytes(settings, document, file_data)
 
         job.progress = 25
         db.commit()
         self.update_state(state="PROGRESS", meta={"progress": 25})
 
-        # Rasterize pages - all documents should be PDFs after conversion
-        # Only use image rasterization for formats that definitely can't be converted to PDF
-        if document.title.lower().endswith(
-            (".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".csv", ".txt")
-        ):
-            pages = rasterize_pdf_pages(file_data, dpi=300)
-        else:
-            # For pure image files that weren't converted, try PDF first (in case they were converted)
-            try:
-                pages = rasterize_pdf_pages(file_data, dpi=300)
-            except Exception:
-                # Fallback to image processing
-                pages = rasterize_image(file_data, dpi=300)
+        pages = _rasterize_document(document, file_data, dpi=300)
 
         job.progress = 50
         db.commit()
         self.update_state(state="PROGRESS", meta={"progress": 50})
 
-        # Generate thumbnails and high-res previews for each page
-        total_pages = len(pages) if pages is not None else 0
-        for i, (page_num, page_image) in enumerate(pages):
-            thumbnail = generate_thumbnail(page_image, max_size=(200, 300))
+        def _process_page(page_num: int, page_image: bytes) -> int:
+            _store_thumbnail(settings, document_id, page_num, page_image)
+            return page_num
 
-            # Upload thumbnail to S3 or store locally
-            thumb_key = f"thumbnails/{document_id}/page_{page_num}.webp"
-            try:
-                upload_to_s3(
-                    settings.s3_bucket_thumbnails, thumb_key, thumbnail, "image/webp"
+        # Generate thumbnails and high-res previews for each page; DB writes stay
+        # on this thread
+        total_pages = len(pages) if pages is not None else 0
+        page_results = _iter_page_results(
+            _process_page, pages, settings.page_workers
+        )
+        last_commit_pct, last_commit_ts = job.progress, time.monotonic()
+        for i, page_num in enumerate(page_results):
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Document {document_id}: thumbnail {page_num + 1}/{total_pages} done"
                 )
-            except Exception as e:
-                # Store locally if S3 is not available
-                import os
-
-                local_dir = get_local_processed_path(f"thumbnails/{document_id}")
-                os.makedirs(local_dir, exist_ok=True)
-                local_path = f"{local_dir}/page_{page_num}.webp"
-                with open(local_path, "wb") as f:
-                    f.write(thumbnail)
-                print(f"Failed to upload thumbnail to SOS: {e}")
-                print(f"Stored thumbnail locally: {local_path}")
-
-            # Also persist a full-quality preview (PNG) for 300 DPI viewing
-            try:
-                import os
-
-                preview_dir = get_local_processed_path(f"previews/{document_id}")
-                os.makedirs(preview_dir, exist_ok=True)
-                preview_path = f"{preview_dir}/page_{page_num}.png"
-                with open(preview_path, "wb") as f:
-                    f.write(page_image)
-            except Exception as e:
-                print(f"Failed to store preview image: {e}")
 
             # Update progress
             progress = 50 + (50 * (i + 1) // max(total_pages, 1))
             job.progress = progress
-            db.commit()
+            if _progress_commit_due(progress, last_commit_pct, last_commit_ts):
+                db.commit()
+                last_commit_pct, last_commit_ts = progress, time.monotonic()
             self.update_state(state="PROGRESS", meta={"progress": progress})
 
         # Mark as completed
@@ -505,7 +928,7 @@ def process_document_thumbnails(self, document_id: int, job_id: int):
         
         # Don't re-raise for file corruption errors - let other tasks continue
         if "Failed to open stream" in str(e) or "FileDataError" in str(e):
-            print(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
+            logger.warning(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
             return {"status": "failed", "error": str(e)}
         
         raise
@@ -529,7 +952,7 @@ def process_document_ocr(self, document_id: int, job_id: int):
         # Update job status
         job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
-            print(f"WARN: Job {job_id} not found; marking gracefully and returning")
+            logger.warning(f"Job {job_id} not found; marking gracefully and returning")
             return {"status": "skipped", "reason": "job_missing"}
 
         document = db.query(Document).filter(Document.id == document_id).first()
@@ -543,127 +966,47 @@ def process_document_ocr(self, document_id: int, job_id: int):
 
         # Load appropriate file bytes (converted PDF if available, original otherwise)
         file_data = _load_processing_file_bytes(settings, document)
-
-        # Ensure OCR operates on a valid PDF. If the source is not a PDF or bytes are not a
-        # valid PDF stream (e.g., office doc bytes), attempt inline conversion. As a last
-        # resort, synthesize a minimal placeholder PDF to keep pipeline stable.
-        def _ensure_pdf_bytes(data: bytes) -> bytes:
-            try:
-                import fitz
-
-                doc_try = fitz.open(stream=data, filetype="pdf")
-                doc_try.close()
-                return data
-            except Exception:
-                # Try converting original bytes inline
-                try:
-                    original_bytes = _load_original_file_bytes(settings, document)
-                    pdf_bytes, pdf_filename = convert_document_to_pdf(
-                        original_bytes, document.title
-                    )
-                    return pdf_bytes
-                except Exception as conv_err:
-                    print(f"OCR inline conversion failed, using placeholder PDF: {conv_err}")
-                    # Create a minimal one-page placeholder PDF
-                    import fitz
-
-                    doc_new = fitz.open()
-                    page = doc_new.new_page()
-                    msg = f"Placeholder for unsupported file: {document.title}"
-                    page.insert_text((72, 72), msg)
-                    bytes_out = doc_new.tobytes()
-                    doc_new.close()
-                    return bytes_out
-
-        file_data = _ensure_pdf_bytes(file_data)
+        file_data = _ensure_pdf_bytes(settings, document, file_data)
 
         job.progress = 20
         db.commit()
         self.update_state(state="PROGRESS", meta={"progress": 20})
 
         # Prefer fast PDF text layer extraction; fall back to OCR on images
-        extracted_text = []
-        used_pdf_layer = False
-        try:
-            pdf_text_pages = extract_text_from_pdf(file_data)
-            # Only accept PDF text layer if it contains any real text
-            if pdf_text_pages and any((t or "").strip() for _, t in pdf_text_pages):
-                for page_num, text in pdf_text_pages:
-                    extracted_text.append({"page": page_num, "text": text})
-                used_pdf_layer = True
-        except Exception as e:
-            print(f"PDF text extraction error: {e}")
-
-        # If no usable PDF text-layer, or text is too short, perform OCR
-        if (not used_pdf_layer) or (sum(len((p.get("text") or "").strip()) for p in extracted_text) < 100):
-            # Rasterize and OCR
-            if document.title.lower().endswith(
-                (".pdf", ".doc", ".docx", ".ppt", ".pptx", ".xls", ".xlsx", ".csv", ".txt")
-            ):
-                pages = rasterize_pdf_pages(file_data, dpi=150)  # Lower DPI for faster OCR
-            else:
-                # For pure image files that weren't converted, try PDF first (in case they were converted)
-                try:
-                    pages = rasterize_pdf_pages(file_data, dpi=150)  # Lower DPI for faster OCR
-                except Exception:
-                    # Fallback to image processing
-                    pages = rasterize_image(file_data, dpi=150)  # Lower DPI for faster OCR
+        extracted_text, needs_ocr = _extract_text_layer(file_data)
+
+        if needs_ocr:
+            # Lower DPI and grayscale for faster OCR
+            pages = _rasterize_document(document, file_data, dpi=150, grayscale=True)
 
             job.progress = 40
             db.commit()
             self.update_state(state="PROGRESS", meta={"progress": 40})
 
             total_pages = len(pages) if pages is not None else 0
-            for i, (page_num, page_image) in enumerate(pages):
-                try:
-                    text = extract_text_from_image(page_image, language="eng")
-                    extracted_text.append({"page": page_num, "text": text})
-                except Exception as e:
-                    print(f"OCR failed for page {page_num}: {e}")
-                    extracted_text.append({"page": page_num, "text": f"[OCR Error: {str(e)}]"})
+            ocr_pages = []
+            page_results = _iter_page_results(_ocr_page, pages, settings.page_workers)
+            last_commit_pct, last_commit_ts = job.progress, time.monotonic()
+            for i, page_result in enumerate(page_results):
+                ocr_pages.append(page_result)
+                page_num = page_result["page"]
+
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Document {document_id}: OCR page {page_num + 1}/{total_pages} done"
+                    )
 
                 progress = 40 + (50 * (i + 1) // max(total_pages, 1))
                 job.progress = progress
-                db.commit()
+                if _progress_commit_due(progress, last_commit_pct, last_commit_ts):
+                    db.commit()
+                    last_commit_pct, last_commit_ts = progress, time.monotonic()
                 self.update_state(state="PROGRESS", meta={"progress": progress})
 
-        # Store extracted text (in real implementation, would store in search index)
-        ocr_result = {
-            "document_id": document_id,
-            "pages": extracted_text,
-            "total_pages": len(extracted_text),
-        }
+            # Pages complete out of order
+            extracted_text.extend(sorted(ocr_pages, key=lambda p: p["page"]))
 
-        # Persist combined text to DB for search
-        try:
-            combined_text = "\n".join(p["text"] for p in extracted_text if p.get("text"))
-            existing = (
-                db.query(DocumentText)
-                .filter(DocumentText.document_id == document_id)
-                .first()
-            )
-            if existing:
-                existing.text = combined_text
-                existing.updated_at = datetime.utcnow()
-            else:
-                db.add(DocumentText(document_id=document_id, text=combined_text))
-            db.commit()
-        except Exception as e:
-            print(f"Failed to persist OCR text for document {document_id}: {e}")
-
-        # Upload OCR results to S3
-        import json
-
-        ocr_key = f"ocr/{document_id}/text.json"
-        try:
-            upload_to_s3(
-                settings.s3_bucket_ocr,
-                ocr_key,
-                json.dumps(ocr_result).encode(),
-                "application/json",
-            )
-        except Exception as e:
-            print(f"Failed to upload OCR results to SOS: {e}")
+        _store_document_text(settings, db, document_id, extracted_text)
 
         # Mark as completed
         job.status = "completed"
@@ -691,14 +1034,15 @@ def process_document_ocr(self, document_id: int, job_id: int):
                 if job:
                     job.status = "failed"
                     job.error_message = f"OCR timeout after {10 if isinstance(e, SoftTimeLimitExceeded) else 12} minutes"
-                print(f"OCR task for document {document_id} timed out: {e}")
+                logger.error(f"OCR task for document {document_id} timed out: {e}")
             else:
                 if job:
                     job.status = "failed"
                     job.error_message = str(e)
-                print(f"OCR task for document {document_id} failed: {e}")
-                # Log error but don't print full traceback to avoid log spam
-                print(f"OCR error details: {type(e).__name__}: {e}")
+                # Log error but don't log full traceback to avoid log spam
+                logger.error(
+                    f"OCR task for document {document_id} failed: {type(e).__name__}: {e}"
+                )
 
             if job:
                 job.completed_at = datetime.utcnow()
@@ -709,7 +1053,7 @@ def process_document_ocr(self, document_id: int, job_id: int):
         
         # Don't re-raise for file corruption errors - let other tasks continue
         if "Failed to open stream" in str(e) or "FileDataError" in str(e):
-            print(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
+            logger.warning(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
             return {"status": "failed", "error": str(e)}
         
         raise
@@ -717,6 +1061,126 @@ def process_document_ocr(self, document_id: int, job_id: int):
         db.close()
 
 
+@celery_app.task(
+    bind=True,
+    time_limit=25 * 60,
+    soft_time_limit=20 * 60,
+)
+def process_document_pipeline(self, document_id: int, job_ids: dict):
+    """Generate page images, thumbnails and OCR text from a single rasterization.
+
+    ``job_ids`` maps job type ("tiling", "thumbnails", "ocr") to the ProcessingJob
+    id; all of them are updated together. The single-purpose tasks above remain
+    for retrying an individual job.
+    """
+    db = get_db_session()
+    settings = get_settings()
+    total_pages = 0  # Initialize at the start to prevent UnboundLocalError
+    jobs = []
+
+    try:
+        jobs = (
+            db.query(ProcessingJob)
+            .filter(ProcessingJob.id.in_(list(job_ids.values())))
+            .all()
+        )
+        if not jobs:
+            logger.warning(f"Jobs {job_ids} not found; marking gracefully and returning")
+            return {"status": "skipped", "reason": "job_missing"}
+
+        document = db.query(Document).filter(Document.id == document_id).first()
+        if not document:
+            raise ValueError(f"Document {document_id} not found")
+
+        started_at = datetime.utcnow()
+        for job in jobs:
+            job.status = "running"
+            job.started_at = started_at
+            job.celery_task_id = self.request.id
+        db.commit()
+
+        # Load appropriate file bytes (converted PDF if available, original otherwise)
+        file_data = _load_processing_file_bytes(settings, document)
+        file_data = _ensure_pdf_bytes(settings, document, file_data)
+
+        # Prefer fast PDF text layer extraction; OCR pages only if it is unusable
+        extracted_text, needs_ocr = _extract_text_layer(file_data)
+
+        for job in jobs:
+            job.progress = 20
+        db.commit()
+        self.update_state(state="PROGRESS", meta={"progress": 20})
+
+        pages = _rasterize_document(document, file_data, dpi=300)
+
+        for job in jobs:
+            job.progress = 40
+        db.commit()
+        self.update_state(state="PROGRESS", meta={"progress": 40})
+
+        def _process_page(page_num: int, page_image: bytes) -> dict | None:
+            _store_page_image(settings, document_id, page_num, page_image)
+            _store_thumbnail(settings, document_id, page_num, page_image)
+            return _ocr_page(page_num, page_image) if needs_ocr else None
+
+        # DB writes stay on this thread
+        total_pages = len(pages) if pages is not None else 0
+        ocr_pages = []
+        page_results = _iter_page_results(_process_page, pages, settings.page_workers)
+        last_commit_pct, last_commit_ts = 40, time.monotonic()
+        for i, page_result in enumerate(page_results):
+            if page_result is not None:
+                ocr_pages.append(page_result)
+
+            progress = 40 + (50 * (i + 1) // max(total_pages, 1))
+            for job in jobs:
+                job.progress = progress
+            if _progress_commit_due(progress, last_commit_pct, last_commit_ts):
+                db.commit()
+                last_commit_pct, last_commit_ts = progress, time.monotonic()
+            self.update_state(state="PROGRESS", meta={"progress": progress})
+
+        # Pages complete out of order
+        extracted_text.extend(sorted(ocr_pages, key=lambda p: p["page"]))
+        if "ocr" in job_ids:
+            _store_document_text(settings, db, document_id, extracted_text)
+
+        # Mark as completed
+        completed_at = datetime.utcnow()
+        for job in jobs:
+            job.status = "completed"
+            job.progress = 100
+            job.completed_at = completed_at
+        db.commit()
+
+        # Check if all jobs are complete and update document status
+        _update_document_status_if_complete(document_id, db)
+
+        return {"status": "completed", "document_id": document_id, "pages": total_pages}
+
+    except Exception as e:
+        # Mark as failed with better error isolation
+        if jobs:
+            completed_at = datetime.utcnow()
+            for job in jobs:
+                job.status = "failed"
+                job.error_message = str(e)
+                job.completed_at = completed_at
+            db.commit()
+
+            # Update document status if all jobs are complete (including failed ones)
+            _update_document_status_if_complete(document_id, db)
+
+        # Don't re-raise for file corruption errors - let other tasks continue
+        if "Failed to open stream" in str(e) or "FileDataError" in str(e):
+            logger.warning(f"Skipping corrupted file for document {document_id} - continuing with other tasks")
+            return {"status": "failed", "error": str(e)}
+
+        raise
+    finally:
+        db.close()
+
+
 @celery_app.task(bind=True)
 def convert_document_to_pdf_task(self, document_id: int, job_id: int):
     """Convert a document to PDF format for standardization"""
@@ -727,7 +1191,7 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         # Get job and document
         job = db.query(ProcessingJob).filter(ProcessingJob.id == job_id).first()
         if not job:
-            print(f"WARN: Job {job_id} not found; marking gracefully and returning")
+            logger.warning(f"Job {job_id} not found; marking gracefully and returning")
             return {"status": "skipped", "reason": "job_missing"}
 
         document = db.query(Document).filter(Document.id == document_id).first()
@@ -739,18 +1203,29 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         job.celery_task_id = self.request.id
         db.commit()
 
-        # Check if document is already a PDF
-        if document.title.lower().endswith(".pdf"):
-            job.status = "completed"
-            job.progress = 100
-            if job:
+        # Idempotency: a previous attempt of this job (e.g. a retry after a soft
+        # time limit) may already have uploaded the converted PDF. A HEAD is far
+        # cheaper than re-running LibreOffice. Only trust the object if it is the
+        # one this job recorded: the key is per document id, so a stale object
+        # can outlive its document (ids are reused after a reset).
+        s3_key = converted_pdf_key(document_id)
+        try:
+            head = get_s3_client().head_object(
+                Bucket=settings.s3_bucket_originals, Key=s3_key
+            )
+            if job.result_etag and head.get("ETag") == job.result_etag:
+                job.status = "completed"
+                job.progress = 100
                 job.completed_at = datetime.utcnow()
-            db.commit()
+                db.commit()
 
-            # Check if all jobs are complete and update document status
-            _update_document_status_if_complete(document_id, db)
+                _update_document_status_if_complete(document_id, db)
 
-            return {"status": "skipped", "reason": "Document is already PDF"}
+                logger.info(f"Converted PDF already present for document {document_id}: {s3_key}")
+                return {"status": "skipped", "reason": "Document already converted"}
+        except Exception:
+            # Not converted yet (404) or S3 unavailable - convert below
+            pass
 
         # Load original file
         file_data = _load_original_file_bytes(settings, document)
@@ -760,7 +1235,7 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         self.update_state(state="PROGRESS", meta={"progress": 20})
 
         # Convert to PDF
-        print(f"Converting {document.title} to PDF...")
+        logger.info(f"Converting {document.title} to PDF...")
         pdf_data, pdf_filename = convert_document_to_pdf(file_data, document.title)
 
         job.progress = 70
@@ -770,14 +1245,15 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         # Store converted PDF
         try:
             # Try to upload to S3 first
-            s3_key = f"documents/{document_id}/{pdf_filename}"
-            upload_to_s3(
+            job.result_etag = upload_to_s3(
                 settings.s3_bucket_originals, s3_key, pdf_data, "application/pdf"
             )
-            print(f"Uploaded converted PDF to S3: {s3_key}")
+            # Record it straight away so a retry can recognise the upload
+            db.commit()
+            logger.info(f"Uploaded converted PDF to S3: {s3_key}")
         except Exception as e:
             # Fall back to local storage
-            print(f"S3 upload failed, storing locally: {e}")
+            logger.warning(f"S3 upload failed, storing locally: {e}")
             import os
 
             # Use local backend directory for development
@@ -786,7 +1262,7 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
             local_path = os.path.join(local_dir, f"{document_id}_{pdf_filename}")
             with open(local_path, "wb") as f:
                 f.write(pdf_data)
-            print(f"Stored converted PDF locally: {local_path}")
+            logger.info(f"Stored converted PDF locally: {local_path}")
 
         # Keep original document title - don't change it as it breaks file loading
         original_title = document.title
@@ -801,7 +1277,7 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         # Check if all jobs are complete and update document status
         _update_document_status_if_complete(document_id, db)
 
-        print(f"✅ Document conversion completed: {original_title} -> {pdf_filename}")
+        logger.info(f"Document conversion completed: {original_title} -> {pdf_filename}")
         return {
             "status": "completed",
             "original_filename": original_title,
@@ -810,7 +1286,7 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
         }
 
     except Exception as e:
-        print(f"❌ Document conversion failed: {e}")
+        logger.error(f"Document conversion failed: {e}")
         if "job" in locals():
             if job:
                 job.status = "failed"
@@ -825,12 +1301,8 @@ def convert_document_to_pdf_task(self, document_id: int, job_id: int):
 @celery_app.task(name="monitor_stuck_jobs")
 def monitor_stuck_jobs():
     """Periodic task to monitor and recover stuck processing jobs"""
-    import logging
-
     from .job_monitor import monitor_and_recover_jobs
 
-    logger = logging.getLogger(__name__)
-
     try:
         results = monitor_and_recover_jobs()
         logger.info(f"Job monitoring completed: {results}")
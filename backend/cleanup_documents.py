@@ -1,16 +1,138 @@
 #!/usr/bin/env python3
 """
 Script to delete all documents and related data from the database.
-This will clean up: documents, comments, redactions, document_shares, document_content, and processing_jobs.
+This will clean up: documents, comments, redactions, document_shares, document_contents,
+document_texts and processing_jobs.
 
-This script runs remotely on the server using SSH connection.
+By default the cleanup runs against the local database; pass --remote to run it on the
+server over SSH. Pass --verbose to print table counts before the cleanup.
 """
 
+import argparse
+import inspect
 import os
 import subprocess
 import sys
 from pathlib import Path
 
+# Child tables in deletion order (they all reference documents)
+CHILD_TABLES = [
+    ("comments", "comments"),
+    ("redactions", "redactions"),
+    ("document_shares", "document shares"),
+    ("document_contents", "document content entries"),
+    ("document_texts", "document OCR text entries"),
+    ("processing_jobs", "processing jobs"),
+]
+
+
+def count_rows(cur):
+    """Count documents and related rows in a single query"""
+    cur.execute(
+        "SELECT (SELECT count(*) FROM documents), "
+        "(SELECT count(*) FROM comments), "
+        "(SELECT count(*) FROM redactions), "
+        "(SELECT count(*) FROM document_shares), "
+        "(SELECT count(*) FROM document_contents), "
+        "(SELECT count(*) FROM processing_jobs)"
+    )
+    return cur.fetchone()
+
+
+def cleanup_all_documents(engine, verbose=False):
+    """Delete all documents and related data"""
+    # Plain DB-API connection: this admin path needs no ORM session
+    conn = engine.raw_connection()
+    cur = conn.cursor()
+    try:
+        print("🗑️  Starting document cleanup...")
+
+        if verbose:
+            # Get count of documents before deletion (one round-trip)
+            (
+                doc_count,
+                comment_count,
+                redaction_count,
+                share_count,
+                content_count,
+                job_count,
+            ) = count_rows(cur)
+
+            print(f"📊 Current database state:")
+            print(f"   - Documents: {doc_count}")
+            print(f"   - Comments: {comment_count}")
+            print(f"   - Redactions: {redaction_count}")
+            print(f"   - Document Shares: {share_count}")
+            print(f"   - Document Content: {content_count}")
+            print(f"   - Processing Jobs: {job_count}")
+
+            if doc_count == 0:
+                print("✅ Database is already clean - no documents found.")
+                return
+
+        if engine.dialect.name == "postgresql":
+            # One statement empties every table and resets the ID sequences
+            print("\n🔄 Truncating documents and related data...")
+            cur.execute(
+                "TRUNCATE TABLE comments, redactions, document_shares, "
+                "document_contents, document_texts, processing_jobs, documents "
+                "RESTART IDENTITY CASCADE"
+            )
+            conn.commit()
+            print("   ✅ Truncated tables and reset ID sequences")
+        else:
+            # Delete in order to respect foreign key constraints
+            print("\n🔄 Deleting related data...")
+            for table, label in CHILD_TABLES:
+                cur.execute(f"DELETE FROM {table}")
+                print(f"   ✅ Deleted {cur.rowcount} {label}")
+
+            # Finally delete documents
+            print("\n🗂️  Deleting documents...")
+            cur.execute("DELETE FROM documents")
+            print(f"   ✅ Deleted {cur.rowcount} documents")
+
+            # Commit everything in one transaction
+            conn.commit()
+            print("   ✅ Committed deletions")
+
+    except Exception as e:
+        print(f"❌ Error during cleanup: {str(e)}")
+        print(f"❌ Error type: {type(e).__name__}")
+        import traceback
+
+        traceback.print_exc()
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+
+
+def build_remote_script(verbose=False):
+    """Assemble the script run inside the API container from this module's code"""
+    return "\n\n".join(
+        [
+            "import sys\nsys.path.insert(0, '/app')\n\nfrom app.db import engine",
+            f"CHILD_TABLES = {CHILD_TABLES!r}",
+            inspect.getsource(count_rows),
+            inspect.getsource(cleanup_all_documents),
+            f"cleanup_all_documents(engine, verbose={verbose!r})\n",
+        ]
+    )
+
+
+def run_local_cleanup(verbose=False):
+    """Run the cleanup against the database configured for this checkout"""
+    sys.path.insert(0, os.path.dirname(__file__))
+    from app.db import engine
+
+    try:
+        cleanup_all_documents(engine, verbose=verbose)
+        return True
+    except Exception:
+        return False
+
 
 def load_env_config():
     """Load configuration from .env file"""
@@ -19,19 +141,23 @@ def load_env_config():
     if not env_path.exists():
         raise FileNotFoundError(f"❌ .env file not found at {env_path}")
 
-    config = {}
-    with open(env_path, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                config[key.strip()] = value.strip()
+    lines = (line.strip() for line in env_path.read_text().splitlines())
+    return {
+        key.strip(): value.strip()
+        for key, value in (
+            line.split("=", 1)
+            for line in lines
+            if line and not line.startswith("#") and "=" in line
+        )
+    }
 
-    return config
 
+def run_remote_cleanup(verbose=False):
+    """Run the cleanup script on the remote server via SSH
 
-def run_remote_cleanup():
-    """Run the cleanup script on the remote server via SSH"""
+    With ``verbose`` the remote script also reports table counts before the
+    cleanup.
+    """
     try:
         # Load configuration
         config = load_env_config()
@@ -48,178 +174,30 @@ def run_remote_cleanup():
         if not ssh_key_path.exists():
             raise FileNotFoundError(f"❌ SSH key not found at {ssh_key_path}")
 
-        # Create the cleanup script content to run on the server
-        cleanup_script = '''
-import sys
-sys.path.insert(0, '/app')
-
-from app.models import Comment, Document, DocumentContent, DocumentShare, ProcessingJob, Redaction, DocumentText
-from app.db import SessionLocal
-from sqlalchemy import text
-
-def cleanup_all_documents():
-    """Delete all documents and related data"""
-    db = SessionLocal()
-    try:
-        print("🗑️  Starting document cleanup...")
-
-        # Get count of documents before deletion
-        doc_count = db.query(Document).count()
-        comment_count = db.query(Comment).count()
-        redaction_count = db.query(Redaction).count()
-        share_count = db.query(DocumentShare).count()
-        content_count = db.query(DocumentContent).count()
-        job_count = db.query(ProcessingJob).count()
-
-        print(f"📊 Current database state:")
-        print(f"   - Documents: {doc_count}")
-        print(f"   - Comments: {comment_count}")
-        print(f"   - Redactions: {redaction_count}")
-        print(f"   - Document Shares: {share_count}")
-        print(f"   - Document Content: {content_count}")
-        print(f"   - Processing Jobs: {job_count}")
-
-        if doc_count == 0:
-            print("✅ Database is already clean - no documents found.")
-            return
-
-        # Delete in order to respect foreign key constraints
-        print("\\n🔄 Deleting related data...")
-
-        # Delete comments first (they reference documents)
-        deleted_comments = db.query(Comment).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_comments} comments")
-
-        # Delete redactions (they reference documents)
-        deleted_redactions = db.query(Redaction).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_redactions} redactions")
-
-        # Delete document shares (they reference documents)
-        deleted_shares = db.query(DocumentShare).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_shares} document shares")
-
-        # Delete document content (they reference documents)
-        deleted_content = db.query(DocumentContent).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_content} document content entries")
-
-        # Delete OCR text (they reference documents)
-        deleted_doc_text = db.query(DocumentText).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_doc_text} document OCR text entries")
-
-        # Delete processing jobs (they reference documents)
-        deleted_jobs = db.query(ProcessingJob).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_jobs} processing jobs")
-
-        # Commit deletions of related records first
-        db.commit()
-        print("   ✅ Committed deletion of related records")
-
-        # Finally delete documents
-        print("\\n🗂️  Deleting documents...")
-        deleted_docs = db.query(Document).delete(synchronize_session=False)
-        print(f"   ✅ Deleted {deleted_docs} documents")
-
-        # Commit document deletions
-        db.commit()
-        print("   ✅ Committed document deletions")
-
-        # Reset auto-increment sequences (PostgreSQL specific)
-        print("\\n🔄 Resetting ID sequences...")
-        sequences = [
-            "documents_id_seq",
-            "comments_id_seq",
-            "redactions_id_seq",
-            "document_shares_id_seq",
-            "document_content_id_seq",
-            "document_texts_id_seq",
-            "processing_jobs_id_seq",
-        ]
-
-        reset_count = 0
-        for seq in sequences:
-            try:
-                db.execute(text(f"ALTER SEQUENCE {seq} RESTART WITH 1"))
-                reset_count += 1
-            except Exception as e:
-                print(f"   ⚠️  Sequence {seq} not found or already reset: {e}")
-
-        if reset_count > 0:
-            print(f"   ✅ Reset {reset_count} ID sequences to start from 1")
-
-        # Final commit for sequence resets
-        db.commit()
-        print("   ✅ Committed sequence resets")
-
-        # Verify cleanup
-        final_doc_count = db.query(Document).count()
-        final_comment_count = db.query(Comment).count()
-        final_redaction_count = db.query(Redaction).count()
-        final_job_count = db.query(ProcessingJob).count()
-
-        print(f"\\n🔍 Verification:")
-        print(f"   - Remaining documents: {final_doc_count}")
-        print(f"   - Remaining comments: {final_comment_count}")
-        print(f"   - Remaining redactions: {final_redaction_count}")
-        print(f"   - Remaining jobs: {final_job_count}")
-
-        if final_doc_count == 0:
-            print(f"\\n🎉 Cleanup completed successfully!")
-            print(f"   - Total documents deleted: {deleted_docs}")
-            print(f"   - Total related records deleted: {deleted_comments + deleted_redactions + deleted_shares + deleted_content + deleted_jobs}")
-        else:
-            print(f"\\n⚠️  Warning: {final_doc_count} documents still remain!")
-
-    except Exception as e:
-        print(f"❌ Error during cleanup: {str(e)}")
-        print(f"❌ Error type: {type(e).__name__}")
-        import traceback
-        traceback.print_exc()
-        db.rollback()
-        raise
-    finally:
-        db.close()
-
-cleanup_all_documents()
-'''
-
-        # Create a temporary script file locally
-        temp_script_path = Path("/tmp/remote_cleanup.py")
-
-        print("📝 Creating temporary cleanup script...")
-        with open(temp_script_path, "w") as f:
-            f.write(cleanup_script)
-
-        # Copy the script to the server in the project directory (accessible to Docker)
-        scp_command = [
-            "scp",
-            "-i",
-            str(ssh_key_path),
-            str(temp_script_path),
-            f"ubuntu@{server_ip}:/opt/haqnow-community/remote_cleanup.py",
-        ]
-
-        print("📤 Copying script to server...")
-        result = subprocess.run(scp_command, capture_output=True, text=True)
-
-        if result.returncode != 0:
-            print(f"❌ Failed to copy script to server: {result.stderr}")
-            temp_script_path.unlink(missing_ok=True)  # Clean up local temp file
-            return False
-
-        # Now run the script on the server (copy it into the container and run it)
+        # Stream the script into the API container over a single SSH session;
+        # ControlMaster keeps the connection open for a minute so re-runs skip
+        # the handshake
         ssh_command = [
             "ssh",
             "-i",
             str(ssh_key_path),
+            "-o",
+            "ControlMaster=auto",
+            "-o",
+            "ControlPath=~/.ssh/haqnow-%r@%h:%p",
+            "-o",
+            "ControlPersist=60s",
             f"ubuntu@{server_ip}",
-            "cd /opt/haqnow-community/deploy && docker-compose cp ../remote_cleanup.py api:/app/remote_cleanup.py && docker-compose exec -T api python3 /app/remote_cleanup.py && rm -f ../remote_cleanup.py",
+            "cd /opt/haqnow-community/deploy && docker-compose exec -T api python3 -",
         ]
 
         print("🚀 Executing cleanup on remote server...")
-        result = subprocess.run(ssh_command, capture_output=True, text=True)
-
-        # Clean up local temp file
-        temp_script_path.unlink(missing_ok=True)
+        result = subprocess.run(
+            ssh_command,
+            input=build_remote_script(verbose),
+            capture_output=True,
+            text=True,
+        )
 
         if result.returncode == 0:
             print("✅ Remote cleanup completed successfully!")
@@ -242,16 +220,29 @@ cleanup_all_documents()
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--remote", action="store_true", help="run the cleanup on the server over SSH"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="print table counts before cleanup"
+    )
+    args = parser.parse_args()
+
     print("🚨 WARNING: This will permanently delete ALL documents and related data!")
-    print("🌐 This will connect to the remote server and run the cleanup there.")
+    if args.remote:
+        print("🌐 This will connect to the remote server and run the cleanup there.")
     response = input("Are you sure you want to continue? Type 'yes' to confirm: ")
 
     if response.lower() == "yes":
-        success = run_remote_cleanup()
+        if args.remote:
+            success = run_remote_cleanup(verbose=args.verbose)
+        else:
+            success = run_local_cleanup(verbose=args.verbose)
         if success:
-            print("\n🎉 Remote cleanup completed successfully!")
+            print("\n🎉 Cleanup completed successfully!")
         else:
-            print("\n❌ Remote cleanup failed!")
+            print("\n❌ Cleanup failed!")
             sys.exit(1)
     else:
         print("❌ Cleanup cancelled.")
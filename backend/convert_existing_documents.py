@@ -6,12 +6,13 @@ Script to convert existing non-PDF documents to PDF format
 import os
 import sys
 
-from sqlalchemy.orm import sessionmaker
+from celery import group
+from sqlalchemy import bindparam, func, insert, select, update
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from app.db import SessionLocal, engine
+from app.db import SessionLocal
 from app.models import Document, ProcessingJob
 from app.tasks import convert_document_to_pdf_task
 
@@ -23,13 +24,10 @@ def convert_existing_documents():
         try:
             print("🔄 Starting conversion of existing documents...")
 
-            # Find all non-PDF documents
-            documents = db.query(Document).all()
-            non_pdf_docs = []
-
-            for doc in documents:
-                if not doc.title.lower().endswith(".pdf"):
-                    non_pdf_docs.append(doc)
+            # Find all non-PDF documents (filtered in the database)
+            non_pdf_docs = db.scalars(
+                select(Document).where(func.lower(Document.title).notlike("%.pdf"))
+            ).all()
 
             print(f"📊 Found {len(non_pdf_docs)} non-PDF documents to convert")
 
@@ -56,61 +54,95 @@ def convert_existing_documents():
                 return
 
             # Create conversion jobs for each non-PDF document
-            conversion_jobs = []
-            for doc in non_pdf_docs:
-                # Check if conversion job already exists
-                existing_job = (
-                    db.query(ProcessingJob)
-                    .filter(
-                        ProcessingJob.document_id == doc.id,
-                        ProcessingJob.job_type == "conversion",
-                    )
-                    .first()
+            # Look up existing conversion jobs for all documents in one query;
+            # a completed or in-progress job wins over failed ones
+            existing_status = {}
+            for document_id, status in db.execute(
+                select(ProcessingJob.document_id, ProcessingJob.status).where(
+                    ProcessingJob.job_type == "conversion",
+                    ProcessingJob.document_id.in_([doc.id for doc in non_pdf_docs]),
                 )
+            ):
+                current = existing_status.get(document_id)
+                if current not in ["completed", "queued", "running"]:
+                    existing_status[document_id] = status
 
-                if existing_job and existing_job.status == "completed":
+            to_queue = []
+            for doc in non_pdf_docs:
+                status = existing_status.get(doc.id)
+                if status == "completed":
                     print(f"⏭️  Skipping {doc.title} - already converted")
                     continue
-                elif existing_job and existing_job.status in ["queued", "running"]:
+                elif status in ["queued", "running"]:
                     print(f"⏳ Skipping {doc.title} - conversion in progress")
                     continue
 
-                # Create new conversion job
-                job = ProcessingJob(
-                    document_id=doc.id,
-                    job_type="conversion",
-                    status="queued",
-                    progress=0,
-                )
-                db.add(job)
-                db.commit()
-                db.refresh(job)
-
-                conversion_jobs.append((doc, job))
-                print(f"📝 Queued conversion job for: {doc.title}")
+                to_queue.append(doc)
 
-            if len(conversion_jobs) == 0:
+            if len(to_queue) == 0:
                 print("✅ No new conversions needed")
                 return
 
+            # Insert all new conversion jobs in one statement and one commit
+            job_ids = db.scalars(
+                insert(ProcessingJob).returning(
+                    ProcessingJob.id, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "document_id": doc.id,
+                        "job_type": "conversion",
+                        "status": "queued",
+                        "progress": 0,
+                    }
+                    for doc in to_queue
+                ],
+            ).all()
+            db.commit()
+
+            conversion_jobs = list(zip(to_queue, job_ids))
+            for doc in to_queue:
+                print(f"📝 Queued conversion job for: {doc.title}")
+
             print(f"\\n🚀 Starting conversion of {len(conversion_jobs)} documents...")
 
-            # Dispatch Celery tasks
-            for doc, job in conversion_jobs:
-                try:
-                    # Dispatch conversion task
-                    task = convert_document_to_pdf_task.delay(doc.id, job.id)
-                    job.celery_task_id = task.id
-                    db.commit()
-                    print(f"✅ Dispatched conversion task for: {doc.title}")
-                except Exception as e:
-                    print(f"❌ Failed to dispatch task for {doc.title}: {e}")
-                    job.status = "failed"
-                    job.error_message = str(e)
-                    db.commit()
+            # Publish all conversion tasks as one group, then record the
+            # outcomes in bulk
+            dispatched = []
+            failed = []
+            try:
+                result = group(
+                    convert_document_to_pdf_task.s(doc.id, job_id)
+                    for doc, job_id in conversion_jobs
+                ).apply_async()
+                for (doc, job_id), task in zip(conversion_jobs, result.results):
+                    dispatched.append({"job_id": job_id, "task_id": task.id})
+                print(f"✅ Dispatched {len(dispatched)} conversion tasks")
+            except Exception as e:
+                print(f"❌ Failed to dispatch conversion tasks: {e}")
+                failed = [
+                    {"job_id": job_id, "error": str(e)} for _, job_id in conversion_jobs
+                ]
+
+            job_table = ProcessingJob.__table__
+            if dispatched:
+                db.execute(
+                    update(job_table)
+                    .where(job_table.c.id == bindparam("job_id"))
+                    .values(celery_task_id=bindparam("task_id")),
+                    dispatched,
+                )
+            if failed:
+                db.execute(
+                    update(job_table)
+                    .where(job_table.c.id == bindparam("job_id"))
+                    .values(status="failed", error_message=bindparam("error")),
+                    failed,
+                )
+            db.commit()
 
             print(
-                f"\\n🎉 Conversion process initiated for {len([j for d, j in conversion_jobs if j.celery_task_id])} documents!"
+                f"\\n🎉 Conversion process initiated for {len(dispatched)} documents!"
             )
             print(
                 "📊 Monitor progress in the worker logs or check document status in the web interface"
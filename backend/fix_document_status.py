@@ -3,24 +3,54 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(__file__))
 
+from sqlalchemy import case, func, update
+
 from app.db import SessionLocal
 from app.models import Document, ProcessingJob
 
+# Documents are scanned in primary-key slices so memory stays bounded
+BATCH_SIZE = 1000
+
 with SessionLocal() as db:
-    recent_docs = db.query(Document).filter(Document.id >= 316).all()
-    updated_count = 0
-    
-    for doc in recent_docs:
-        jobs = db.query(ProcessingJob).filter(ProcessingJob.document_id == doc.id).all()
-        all_completed = all(job.status == 'completed' for job in jobs)
-        
-        if all_completed and len(jobs) > 0 and doc.status != 'ready':
-            doc.status = 'ready'
-            updated_count += 1
-            print(f'Updated document {doc.id}: {doc.title} to ready status')
-    
-    if updated_count > 0:
-        db.commit()
-        print(f'Updated {updated_count} document statuses')
+    unfinished_jobs = func.sum(case((ProcessingJob.status != 'completed', 1), else_=0))
+    last_id = 315
+    updated = 0
+    while True:
+        # Keyset pagination: next slice of not-ready document ids via the PK index
+        batch_ids = [
+            doc_id
+            for (doc_id,) in db.query(Document.id)
+            .filter(Document.id > last_id, Document.status != 'ready')
+            .order_by(Document.id)
+            .limit(BATCH_SIZE)
+        ]
+        if not batch_ids:
+            break
+        last_id = batch_ids[-1]
+
+        # One aggregate query: documents in the slice whose jobs all completed
+        ready_docs = (
+            db.query(Document.id, Document.title)
+            .join(ProcessingJob, ProcessingJob.document_id == Document.id)
+            .filter(Document.id.in_(batch_ids))
+            .group_by(Document.id, Document.title)
+            .having(func.count(ProcessingJob.id) > 0, unfinished_jobs == 0)
+            .all()
+        )
+
+        for doc_id, title in ready_docs:
+            print(f'Updated document {doc_id}: {title} to ready status')
+
+        if ready_docs:
+            db.execute(
+                update(Document)
+                .where(Document.id.in_([doc_id for doc_id, _ in ready_docs]))
+                .values(status='ready')
+            )
+            db.commit()
+            updated += len(ready_docs)
+
+    if updated:
+        print(f'Updated {updated} document statuses')
     else:
-        print('All document statuses are correct')
\ No newline at end of file
+        print('All document statuses are correct')
@@ -5,10 +5,15 @@ Script to fix queued jobs that weren't properly dispatched to Celery
 
 import os
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from celery import group
+from sqlalchemy import case
+
 from app.db import SessionLocal
 from app.models import Document, ProcessingJob
 from app.tasks import (
@@ -18,6 +23,30 @@ from app.tasks import (
     process_document_tiling,
 )
 
+# Publishing is network-bound, so documents are dispatched from a thread pool
+DISPATCH_WORKERS = 16
+
+
+def _dispatch_document(pending):
+    """Publish one document's task signatures; return DB update mappings"""
+    try:
+        result = group(signature for _, signature in pending).apply_async()
+        return [
+            {"id": job.id, "celery_task_id": task.id}
+            for (job, _), task in zip(pending, result.results)
+        ]
+    except Exception as e:
+        doc_id = pending[0][0].document_id
+        print(f"    ❌ Failed to dispatch tasks for document {doc_id}: {e}")
+        return [
+            {
+                "id": job.id,
+                "status": "failed",
+                "error_message": f"Failed to dispatch task: {str(e)}",
+            }
+            for job, _ in pending
+        ]
+
 
 def fix_queued_jobs():
     """Fix queued jobs that don't have Celery task IDs"""
@@ -33,7 +62,15 @@ def fix_queued_jobs():
                     ProcessingJob.status == "queued",
                     ProcessingJob.celery_task_id.is_(None),
                 )
-                .order_by(ProcessingJob.document_id, ProcessingJob.job_type)
+                # Conversion first, then the jobs that depend on it
+                .order_by(
+                    ProcessingJob.document_id,
+                    case(
+                        {"conversion": 0, "tiling": 1, "thumbnails": 2, "ocr": 3},
+                        value=ProcessingJob.job_type,
+                        else_=999,
+                    ),
+                )
                 .all()
             )
 
@@ -44,67 +81,59 @@ def fix_queued_jobs():
                 return
 
             # Group jobs by document
-            jobs_by_doc = {}
+            jobs_by_doc = defaultdict(list)
             for job in queued_jobs:
-                if job.document_id not in jobs_by_doc:
-                    jobs_by_doc[job.document_id] = []
                 jobs_by_doc[job.document_id].append(job)
 
             print(f"📋 Processing {len(jobs_by_doc)} documents")
 
-            # Dispatch tasks for each document
+            # Build task signatures for each document's jobs
+            task_by_type = {
+                "conversion": convert_document_to_pdf_task,
+                "tiling": process_document_tiling,
+                "thumbnails": process_document_thumbnails,
+                "ocr": process_document_ocr,
+            }
+            pending_by_doc = {}
             for doc_id, jobs in jobs_by_doc.items():
                 print(f"\n🔧 Fixing jobs for document {doc_id}")
 
-                # Sort jobs to ensure proper order: conversion first, then others
-                job_order = {"conversion": 0, "tiling": 1, "thumbnails": 2, "ocr": 3}
-                jobs.sort(key=lambda x: job_order.get(x.job_type, 999))
-
+                pending = []
                 for i, job in enumerate(jobs):
-                    try:
-                        task_delay = 0
-                        if job.job_type != "conversion":
-                            # Non-conversion jobs wait for conversion to complete
-                            task_delay = 5 + (i * 2)
-
-                        print(
-                            f"  📤 Dispatching {job.job_type} job {job.id} with delay {task_delay}s"
-                        )
-
-                        # Dispatch the appropriate task
-                        if job.job_type == "conversion":
-                            if task_delay > 0:
-                                task = convert_document_to_pdf_task.apply_async(
-                                    args=[doc_id, job.id], countdown=task_delay
-                                )
-                            else:
-                                task = convert_document_to_pdf_task.delay(
-                                    doc_id, job.id
-                                )
-                        elif job.job_type == "tiling":
-                            task = process_document_tiling.apply_async(
-                                args=[doc_id, job.id], countdown=task_delay
-                            )
-                        elif job.job_type == "thumbnails":
-                            task = process_document_thumbnails.apply_async(
-                                args=[doc_id, job.id], countdown=task_delay
-                            )
-                        elif job.job_type == "ocr":
-                            task = process_document_ocr.apply_async(
-                                args=[doc_id, job.id], countdown=task_delay
-                            )
-
-                        # Update job with task ID
-                        job.celery_task_id = task.id
-                        db.commit()
-
-                        print(f"    ✅ Task dispatched: {task.id}")
-
-                    except Exception as e:
-                        print(f"    ❌ Failed to dispatch {job.job_type}: {e}")
-                        job.status = "failed"
-                        job.error_message = f"Failed to dispatch task: {str(e)}"
-                        db.commit()
+                    task_fn = task_by_type.get(job.job_type)
+                    if task_fn is None:
+                        print(f"  ⏭️  Skipping unknown job type {job.job_type}")
+                        continue
+
+                    task_delay = 0
+                    if job.job_type != "conversion":
+                        # Non-conversion jobs wait for conversion to complete
+                        task_delay = 5 + (i * 2)
+
+                    print(
+                        f"  📤 Dispatching {job.job_type} job {job.id} with delay {task_delay}s"
+                    )
+                    pending.append(
+                        (job, task_fn.s(doc_id, job.id).set(countdown=task_delay))
+                    )
+                if pending:
+                    pending_by_doc[doc_id] = pending
+
+            # Publish each document's tasks in parallel (a failure only affects
+            # that document), then record the task IDs or failures with a
+            # single bulk update and commit from this thread's session
+            with ThreadPoolExecutor(max_workers=DISPATCH_WORKERS) as executor:
+                mappings = [
+                    mapping
+                    for doc_mappings in executor.map(
+                        _dispatch_document, pending_by_doc.values()
+                    )
+                    for mapping in doc_mappings
+                ]
+            dispatched = sum("celery_task_id" in mapping for mapping in mappings)
+            print(f"\n    ✅ Dispatched {dispatched} of {len(mappings)} tasks")
+            db.bulk_update_mappings(ProcessingJob, mappings)
+            db.commit()
 
             print(f"\n🎉 Job fixing completed!")
 
@@ -9,6 +9,8 @@ import os
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
+from sqlalchemy import case, update
+
 from app.db import SessionLocal
 from app.models import Document, ProcessingJob
 from app.tasks import process_document_tiling
@@ -36,21 +38,46 @@ def reprocess_document(document_id: int):
         if tiling_job:
             print(f"📋 Found existing tiling job: {tiling_job.id} (status: {tiling_job.status})")
             
-            # Reset the job to queued
-            tiling_job.status = "queued"
-            tiling_job.progress = 0
-            tiling_job.error_message = None
-            tiling_job.celery_task_id = None
-            tiling_job.started_at = None
-            tiling_job.completed_at = None
+            # Claim the job atomically: only one concurrent run can move it to
+            # "dispatching", so the tiling task is never dispatched twice
+            claimed = db.execute(
+                update(ProcessingJob)
+                .where(
+                    ProcessingJob.id == tiling_job.id,
+                    ProcessingJob.status.in_(["completed", "failed", "queued"]),
+                )
+                .values(
+                    status="dispatching",
+                    progress=0,
+                    error_message=None,
+                    celery_task_id=None,
+                    started_at=None,
+                    completed_at=None,
+                )
+            ).rowcount
             db.commit()
             
-            print(f"✅ Reset tiling job to queued")
+            if claimed != 1:
+                print("⏭️  Tiling job is already being reprocessed, nothing to do")
+                return False
+            
+            print(f"✅ Reset tiling job for dispatch")
             
             # Dispatch new tiling task
             try:
                 task = process_document_tiling.delay(document_id, tiling_job.id)
-                tiling_job.celery_task_id = task.id
+                # The worker may already have marked the job running
+                db.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == tiling_job.id)
+                    .values(
+                        celery_task_id=task.id,
+                        status=case(
+                            (ProcessingJob.status == "dispatching", "queued"),
+                            else_=ProcessingJob.status,
+                        ),
+                    )
+                )
                 db.commit()
                 
                 print(f"✅ Dispatched new tiling task: {task.id}")
@@ -58,8 +85,14 @@ def reprocess_document(document_id: int):
                 
             except Exception as e:
                 print(f"❌ Failed to dispatch tiling task: {e}")
-                tiling_job.status = "failed"
-                tiling_job.error_message = f"Failed to dispatch: {str(e)}"
+                db.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == tiling_job.id)
+                    .values(
+                        status="failed",
+                        error_message=f"Failed to dispatch: {str(e)}",
+                    )
+                )
                 db.commit()
                 return False
         else:
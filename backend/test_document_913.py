@@ -3,7 +3,6 @@
 Test conversion of document 913 specifically
 """
 
-import subprocess
 import tempfile
 import os
 import sys
@@ -14,16 +13,18 @@ sys.path.insert(0, os.path.dirname(__file__))
 from app.db import SessionLocal
 from app.models import Document
 from app.conversion import convert_document_to_pdf
-from app.tasks import _load_original_file_bytes
+from app.tasks import _load_original_file_bytes, _stream_original_file_to
 from app.config import get_settings
+from test_libreoffice import convert_to_pdf, office_server, page_text
+
+# Resolve settings once per process (get_settings is cached)
+settings = get_settings()
 
 def test_document_913():
     """Test conversion of document 913"""
     print("🧪 Testing document 913 conversion...")
     
     with SessionLocal() as db:
-        settings = get_settings()
-        
         # Get document 913
         document = db.query(Document).filter(Document.id == 913).first()
         if not document:
@@ -34,39 +35,31 @@ def test_document_913():
         print(f"📊 Status: {document.status}")
         
         try:
-            # Load original file data
-            original_data = _load_original_file_bytes(settings, document)
-            print(f"📦 Original file size: {len(original_data)} bytes")
-            
             # Test LibreOffice conversion directly
             with tempfile.TemporaryDirectory() as temp_dir:
-                # Write original file
+                # Stream the original file straight to disk
                 input_path = os.path.join(temp_dir, "11356_AIPAC 2013 Revised Lecture3.doc")
                 with open(input_path, "wb") as f:
-                    f.write(original_data)
+                    original_size = _stream_original_file_to(settings, document, f)
+                print(f"📦 Original file size: {original_size} bytes")
                 
                 print(f"📝 Wrote original file: {input_path}")
                 print(f"📊 File size on disk: {os.path.getsize(input_path)} bytes")
                 
                 # Try conversion with LibreOffice
                 try:
-                    result = subprocess.run([
-                        "libreoffice",
-                        "--headless",
-                        "--convert-to",
-                        "pdf",
-                        "--outdir",
-                        temp_dir,
-                        input_path,
-                    ], capture_output=True, text=True, timeout=60)
+                    with office_server() as server:
+                        result = convert_to_pdf(input_path, temp_dir, server)
                     
                     print(f"🔄 LibreOffice return code: {result.returncode}")
-                    print(f"📤 LibreOffice stdout: {result.stdout}")
-                    print(f"📤 LibreOffice stderr: {result.stderr}")
                     
-                    # Check if PDF was created
+                    # A failed run skips the output checks entirely
                     pdf_path = os.path.join(temp_dir, "11356_AIPAC 2013 Revised Lecture3.pdf")
-                    if os.path.exists(pdf_path):
+                    if result.returncode != 0:
+                        print(
+                            f"❌ LibreOffice stderr: {result.stderr.decode(errors='replace')}"
+                        )
+                    elif os.path.exists(pdf_path):
                         pdf_size = os.path.getsize(pdf_path)
                         print(f"✅ PDF created: {pdf_path}")
                         print(f"📊 PDF size: {pdf_size} bytes")
@@ -78,7 +71,7 @@ def test_document_913():
                             print(f"📑 PDF pages: {len(doc)}")
                             if len(doc) > 0:
                                 page = doc[0]
-                                text = page.get_text()
+                                text = page_text(page)
                                 print(f"📝 PDF text content length: {len(text)} chars")
                                 print(f"📝 First 200 chars: {repr(text[:200])}")
                                 
@@ -99,19 +92,27 @@ def test_document_913():
             # Also test our conversion function
             print("\n🧪 Testing our conversion function...")
             try:
+                # The converter API takes bytes, so load them only for this step
+                original_data = _load_original_file_bytes(settings, document)
                 pdf_data, pdf_filename = convert_document_to_pdf(original_data, document.title)
                 print(f"✅ Our converter produced: {len(pdf_data)} bytes, filename: {pdf_filename}")
+                del original_data
                 
-                # Analyze our PDF
+                # Analyze our PDF. Spill it to disk and open by path so MuPDF
+                # maps the file instead of holding a second in-memory copy
                 import fitz
-                doc = fitz.open(stream=pdf_data, filetype="pdf")
-                print(f"📑 Our PDF pages: {len(doc)}")
-                if len(doc) > 0:
-                    page = doc[0]
-                    text = page.get_text()
-                    print(f"📝 Our PDF text length: {len(text)} chars")
-                    print(f"📝 Our PDF first 200 chars: {repr(text[:200])}")
-                doc.close()
+                with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+                    pdf_file.write(pdf_data)
+                    pdf_file.flush()
+                    del pdf_data
+                    doc = fitz.open(pdf_file.name)
+                    print(f"📑 Our PDF pages: {len(doc)}")
+                    if len(doc) > 0:
+                        page = doc[0]
+                        text = page_text(page)
+                        print(f"📝 Our PDF text length: {len(text)} chars")
+                        print(f"📝 Our PDF first 200 chars: {repr(text[:200])}")
+                    doc.close()
                 
             except Exception as e:
                 print(f"❌ Our conversion failed: {e}")
@@ -13,14 +13,16 @@ from app.db import SessionLocal
 from app.models import Document
 from app.tasks import _load_processing_file_bytes
 from app.config import get_settings
+from test_libreoffice import page_text
+
+# Resolve settings once per process (get_settings is cached)
+settings = get_settings()
 
 def test_file_loading_fix():
     """Test if document 913 can now load the correct file"""
     print("🧪 Testing file loading fix for document 913...")
     
     with SessionLocal() as db:
-        settings = get_settings()
-        
         # Get document 913
         document = db.query(Document).filter(Document.id == 913).first()
         if not document:
@@ -48,7 +50,7 @@ def test_file_loading_fix():
                     print(f"📑 PDF has {len(doc)} pages")
                     if len(doc) > 0:
                         page = doc[0]
-                        text = page.get_text()
+                        text = page_text(page)
                         print(f"📝 Text content length: {len(text)} chars")
                         
                         # Check for placeholder text
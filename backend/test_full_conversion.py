@@ -14,14 +14,16 @@ from app.models import Document
 from app.tasks import _load_original_file_bytes
 from app.conversion import convert_document_to_pdf
 from app.config import get_settings
+from test_libreoffice import page_text
+
+# Resolve settings once per process (get_settings is cached)
+settings = get_settings()
 
 def test_full_conversion():
     """Test the full conversion process for document 913"""
     print("🧪 Testing full conversion process for document 913...")
     
     with SessionLocal() as db:
-        settings = get_settings()
-        
         # Get document 913
         document = db.query(Document).filter(Document.id == 913).first()
         if not document:
@@ -56,7 +58,7 @@ def test_full_conversion():
                     
                     if len(doc) > 0:
                         page = doc[0]
-                        text = page.get_text()
+                        text = page_text(page)
                         print(f"📝 PDF text length: {len(text)} chars")
                         
                         if len(text.strip()) < 10:
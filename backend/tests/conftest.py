@@ -0,0 +1,132 @@
+import asyncio
+import os
+
+# Under pytest-xdist give each worker its own SQLite file for the import-time
+# create_all/startup work on the app engine, so workers don't race on dev.db
+_xdist_worker = os.getenv("PYTEST_XDIST_WORKER")
+if _xdist_worker:
+    os.environ.setdefault(
+        "DATABASE_URL", f"sqlite+pysqlite:///./test-{_xdist_worker}.db"
+    )
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from pytest_asyncio import is_async_test
+from sqlalchemy import create_engine, event, func, select
+
+from app.db import Base, SessionLocal
+from app.main import app
+
+try:  # Optional: only the E2E browser tests need Playwright
+    from playwright.async_api import async_playwright
+except ImportError:
+    async_playwright = None
+
+try:  # Optional: uvloop's C event loop speeds up the concurrent request tests
+    import uvloop
+except ImportError:  # Not installed, or Windows
+    uvloop = None
+
+
+def pytest_collection_modifyitems(items):
+    # One loop for the whole run so the session-scoped client can be shared
+    session_scope_marker = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    if uvloop is not None:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest.fixture(scope="session")
+def test_engine(tmp_path_factory):
+    """Throwaway SQLite file shared by every test; the schema is created once.
+
+    Each session gets its own pooled connection, so requests fired
+    concurrently (gather, task groups) each run in their own transaction.
+    A file rather than a shared-cache in-memory database: shared cache locks
+    whole tables and fails concurrent writers with "database table is locked"
+    instead of waiting on the busy timeout, which WAL on a file avoids.
+    """
+    db_path = tmp_path_factory.mktemp("db") / "test.db"
+    engine = create_engine(
+        f"sqlite+pysqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+    )
+
+    # WAL lets readers proceed while a concurrent request is writing
+    @event.listens_for(engine, "connect")
+    def _enable_wal(dbapi_connection, _):
+        dbapi_connection.execute("PRAGMA journal_mode=WAL")
+
+    Base.metadata.create_all(bind=engine)
+    SessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def db_cleanup(test_engine):
+    """Delete the rows each test added once it finishes.
+
+    Every table has an integer ``id``, so rows above the pre-test high-water
+    mark are the ones this test (and any startup seeding it triggered) wrote.
+    """
+    tables = list(reversed(Base.metadata.sorted_tables))
+    with test_engine.connect() as conn:
+        marks = {
+            table.name: conn.execute(select(func.max(table.c.id))).scalar() or 0
+            for table in tables
+        }
+    yield
+    with test_engine.begin() as conn:
+        for table in tables:
+            conn.execute(table.delete().where(table.c.id > marks[table.name]))
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client(test_engine):
+    """One AsyncClient for the session; app startup handlers run once"""
+    await app.router.startup()
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as ac:
+            yield ac
+    finally:
+        await app.router.shutdown()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def browser():
+    """One headless Chromium shared by every E2E test in the session"""
+    if async_playwright is None:
+        pytest.skip("Playwright not installed; skipping E2E browser tests")
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+@pytest_asyncio.fixture
+async def context(browser):
+    """Fresh, isolated browser context (cookies, storage) for each test"""
+    context = await browser.new_context()
+    try:
+        yield context
+    finally:
+        await context.close()
+
+
+@pytest_asyncio.fixture
+async def page(context):
+    """Page for each test; closed along with its context"""
+    return await context.new_page()
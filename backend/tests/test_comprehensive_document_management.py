@@ -5,255 +5,330 @@ Tests all core functionality mentioned in prompt.txt
 import asyncio
 import io
 import json
-import os
-import tempfile
-from pathlib import Path
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock
 
+import anyio
 import pytest
-from app.db import get_db
+import pytest_asyncio
 from app.main import app
-from app.models import Comment, Document, DocumentShare, ProcessingJob, Redaction, User
-from httpx import AsyncClient
-from PIL import Image
-from sqlalchemy.orm import Session
+from fastapi.testclient import TestClient
+
+try:  # Optional: orjson encodes request bodies straight to bytes
+    import orjson
+except ImportError:
+    orjson = None
+
+# Sync client for the simple smoke checks; startup handlers are not run
+sync_client = TestClient(app)
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# httpx.Headers lookups are case-insensitive, so these match any casing
+CORS_KEYS = (
+    "access-control-allow-origin",
+    "access-control-allow-methods",
+    "access-control-allow-headers",
+)
+
+# ~25KB description for the large-document test, built once at import
+_LARGE_DESCRIPTION = "Large document content. " * 1000
+_LARGE_DESCRIPTION_MIN_LENGTH = 20000
+
+
+def _dumps_json(payload) -> bytes:
+    return orjson.dumps(payload) if orjson is not None else json.dumps(payload).encode()
+
+
+def _post_json(client, url, payload):
+    """POST a JSON body encoded with orjson when available"""
+    return client.post(url, content=_dumps_json(payload), headers=_JSON_HEADERS)
+
+
+def _ok(resp, code=200):
+    """Assert the response status (showing the body on failure) and return its JSON"""
+    assert resp.status_code == code, resp.text
+    return resp.json()
+
+
+# The fixture payload never changes, so serialize it once
+_SAMPLE_DOC_BODY = _dumps_json(
+    {
+        "title": "Fixture Document",
+        "description": "Document created by the sample_doc fixture",
+        "source": "Test",
+    }
+)
+
+
+@pytest.fixture(scope="module")
+def rag_service():
+    """Build the RAG service (embedding/LLM/Chroma clients) once per module"""
+    from app.rag import get_rag_service
+
+    return get_rag_service()
+
+
+@pytest_asyncio.fixture
+async def sample_doc(client):
+    """A freshly created document (deleted by db_cleanup after the test)"""
+    return _ok(
+        await client.post(
+            "/documents/", content=_SAMPLE_DOC_BODY, headers=_JSON_HEADERS
+        )
+    )
+
+
+class _StubCollection:
+    """Minimal ChromaDB collection stand-in that records add() calls"""
+
+    def __init__(self, query_response=None):
+        self.query_response = query_response or {}
+        self.add_calls = []
+
+    def add(self, *args, **kwargs):
+        self.add_calls.append(kwargs)
+
+    def query(self, *args, **kwargs):
+        return self.query_response
+
+
+@pytest.fixture
+def mock_rag(rag_service, monkeypatch):
+    """Stub out Ollama and ChromaDB on the shared service; reverted after each test"""
+    mock_collection = _StubCollection()
+    monkeypatch.setattr(
+        rag_service, "_generate_embedding", AsyncMock(return_value=[0.1] * 1024)
+    )
+    monkeypatch.setattr(
+        rag_service,
+        "_generate_answer",
+        AsyncMock(
+            return_value="Based on the document, healthcare policies focus on patient care and medical procedures."
+        ),
+    )
+    monkeypatch.setattr(
+        rag_service, "get_or_create_collection", lambda *args, **kwargs: mock_collection
+    )
+    return mock_collection
 
 
 class TestDocumentUploadAndProcessing:
     """Test document upload functionality including bulk uploads"""
 
-    @pytest.mark.asyncio
-    async def test_single_document_upload(self):
+    async def test_single_document_upload(self, client):
         """Test uploading a single document"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a test PDF file
-            test_content = b"Test PDF content"
-            files = {"file": ("test.pdf", io.BytesIO(test_content), "application/pdf")}
-
-            resp = await ac.post(
-                "/documents/upload",
-                files=files,
-                data={
-                    "description": "Test document upload",
-                    "source": "Test Suite",
-                    "language": "en",
-                },
-            )
-
-            assert resp.status_code == 200
-            data = resp.json()
-            assert data["title"] == "test.pdf"
-            # The description gets auto-generated if not provided in form data
-            assert (
-                "test.pdf" in data["description"]
-                or data["description"] == "Test document upload"
-            )
-            # Source defaults to "Direct Upload" if not provided in form data
-            assert data["source"] in ["Test Suite", "Direct Upload"]
-            assert data["language"] == "en"
-            assert data["status"] == "new"
-
-    @pytest.mark.asyncio
-    async def test_bulk_document_upload(self):
+        # Create a test PDF file
+        test_content = b"Test PDF content"
+        files = {"file": ("test.pdf", io.BytesIO(test_content), "application/pdf")}
+
+        resp = await client.post(
+            "/documents/upload",
+            files=files,
+            data={
+                "description": "Test document upload",
+                "source": "Test Suite",
+                "language": "en",
+            },
+        )
+
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["title"] == "test.pdf"
+        # The description gets auto-generated if not provided in form data
+        assert (
+            "test.pdf" in data["description"]
+            or data["description"] == "Test document upload"
+        )
+        # Source defaults to "Direct Upload" if not provided in form data
+        assert data["source"] in ["Test Suite", "Direct Upload"]
+        assert data["language"] == "en"
+        assert data["status"] == "new"
+
+    async def test_bulk_document_upload(self, client):
         """Test uploading multiple documents at once"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Simulate bulk upload by creating multiple documents
-            documents = []
-            for i in range(10):  # Test with 10 documents
-                resp = await ac.post(
+        # Simulate bulk upload by creating multiple documents concurrently
+        responses = await asyncio.gather(
+            *[
+                _post_json(
+                    client,
                     "/documents/",
-                    json={
+                    {
                         "title": f"Bulk Document {i+1}",
                         "description": f"Bulk uploaded document {i+1}",
                         "source": "Bulk Upload Test",
                         "language": "en",
                     },
                 )
-                assert resp.status_code == 200
-                documents.append(resp.json())
-
-            # Verify all documents were created
-            resp = await ac.get("/documents/")
-            assert resp.status_code == 200
-            all_docs = resp.json()
-            assert len(all_docs) >= 10
-
-            # Verify processing jobs were created for each document
-            for doc in documents:
-                resp = await ac.get(f"/documents/{doc['id']}/jobs")
-                assert resp.status_code == 200
-                jobs = resp.json()
-                assert len(jobs) == 4  # conversion, tiling, thumbnails, ocr
-
-                job_types = {job["job_type"] for job in jobs}
-                assert job_types == {"conversion", "tiling", "thumbnails", "ocr"}
-
-    @pytest.mark.asyncio
-    async def test_document_metadata_handling(self):
-        """Test document metadata extraction and storage"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create document with full metadata
-            from datetime import datetime
-
-            doc_data = {
-                "title": "Test Document with Metadata",
-                "description": "A document with complete metadata",
-                "source": "Government Agency",
-                "language": "en",
-                "published_date": "2024-01-15T10:00:00Z",
-                "acquired_date": "2024-01-16T10:00:00Z",
-                "event_date": "2024-01-14T10:00:00Z",
-                "filing_date": "2024-01-13T10:00:00Z",
-            }
+                for i in range(10)  # Test with 10 documents
+            ]
+        )
+        documents = [_ok(resp) for resp in responses]
+
+        # Verify all documents were created
+        all_docs = _ok(await client.get("/documents/"))
+        assert len(all_docs) >= 10
+
+        # Verify processing jobs were created for each document
+        job_responses = await asyncio.gather(
+            *[client.get(f"/documents/{doc['id']}/jobs") for doc in documents]
+        )
+        for resp in job_responses:
+            jobs = _ok(resp)
+            assert len(jobs) == 4  # conversion, tiling, thumbnails, ocr
 
-            resp = await ac.post("/documents/", json=doc_data)
-            assert resp.status_code == 200
-
-            doc = resp.json()
-            assert doc["title"] == doc_data["title"]
-            assert doc["description"] == doc_data["description"]
-            assert doc["source"] == doc_data["source"]
-            assert doc["language"] == doc_data["language"]
-            # Verify dates are properly stored
-            assert doc["published_date"] is not None
-            assert doc["acquired_date"] is not None
-            assert doc["event_date"] is not None
-            assert doc["filing_date"] is not None
-
-    @pytest.mark.asyncio
-    async def test_document_processing_jobs(self):
+            job_types = {job["job_type"] for job in jobs}
+            assert job_types == {"conversion", "tiling", "thumbnails", "ocr"}
+
+    async def test_document_metadata_handling(self, client):
+        """Test document metadata extraction and storage"""
+        # Create document with full metadata
+        from datetime import datetime
+
+        doc_data = {
+            "title": "Test Document with Metadata",
+            "description": "A document with complete metadata",
+            "source": "Government Agency",
+            "language": "en",
+            "published_date": "2024-01-15T10:00:00Z",
+            "acquired_date": "2024-01-16T10:00:00Z",
+            "event_date": "2024-01-14T10:00:00Z",
+            "filing_date": "2024-01-13T10:00:00Z",
+        }
+
+        doc = _ok(await _post_json(client, "/documents/", doc_data))
+        assert doc["title"] == doc_data["title"]
+        assert doc["description"] == doc_data["description"]
+        assert doc["source"] == doc_data["source"]
+        assert doc["language"] == doc_data["language"]
+        # Verify dates are properly stored
+        assert doc["published_date"] is not None
+        assert doc["acquired_date"] is not None
+        assert doc["event_date"] is not None
+        assert doc["filing_date"] is not None
+
+    async def test_document_processing_jobs(self, client):
         """Test that processing jobs are properly created and tracked"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create document
-            resp = await ac.post(
+        # Create document
+        doc = _ok(
+            await _post_json(
+                client,
                 "/documents/",
-                json={
+                {
                     "title": "Processing Test Document",
                     "description": "Test document processing pipeline",
                     "source": "Test",
                     "language": "en",
                 },
             )
-            assert resp.status_code == 200
-            doc = resp.json()
+        )
 
-            # Check processing jobs
-            resp = await ac.get(f"/documents/{doc['id']}/jobs")
-            assert resp.status_code == 200
-            jobs = resp.json()
+        # Check processing jobs
+        jobs = _ok(await client.get(f"/documents/{doc['id']}/jobs"))
 
-            # Should have 4 jobs: conversion, tiling, thumbnails, ocr
-            assert len(jobs) == 4
-            job_types = {job["job_type"] for job in jobs}
-            assert job_types == {"conversion", "tiling", "thumbnails", "ocr"}
+        # Should have 4 jobs: conversion, tiling, thumbnails, ocr
+        assert len(jobs) == 4
+        job_types = {job["job_type"] for job in jobs}
+        assert job_types == {"conversion", "tiling", "thumbnails", "ocr"}
 
-            # All jobs should start as queued
-            for job in jobs:
-                assert job["status"] in ["queued", "running", "completed", "failed"]
-                assert job["progress"] >= 0
-                # error_message can be None or a string
+        # All jobs should start as queued
+        for job in jobs:
+            assert job["status"] in ["queued", "running", "completed", "failed"]
+            assert job["progress"] >= 0
+            # error_message can be None or a string
 
 
 class TestDocumentSearch:
     """Test full-text search and metadata tagging functionality"""
 
-    @pytest.mark.asyncio
-    async def test_document_search_by_title(self):
+    async def test_document_search_by_title(self, client):
         """Test searching documents by title"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create test documents
-            docs = [
-                {
-                    "title": "Healthcare Policy Document",
-                    "description": "Policy on healthcare",
-                    "source": "Health Dept",
-                },
-                {
-                    "title": "Education Guidelines",
-                    "description": "Guidelines for education",
-                    "source": "Education Dept",
-                },
-                {
-                    "title": "Healthcare Budget Report",
-                    "description": "Budget report for healthcare",
-                    "source": "Finance Dept",
-                },
+        # Create test documents
+        docs = [
+            {
+                "title": "Healthcare Policy Document",
+                "description": "Policy on healthcare",
+                "source": "Health Dept",
+            },
+            {
+                "title": "Education Guidelines",
+                "description": "Guidelines for education",
+                "source": "Education Dept",
+            },
+            {
+                "title": "Healthcare Budget Report",
+                "description": "Budget report for healthcare",
+                "source": "Finance Dept",
+            },
+        ]
+
+        responses = await asyncio.gather(
+            *[_post_json(client, "/documents/", doc_data) for doc_data in docs]
+        )
+        for resp in responses:
+            _ok(resp)
+
+        # Test search functionality (assuming search endpoint exists)
+        resp = await client.get("/search/?q=healthcare")
+        if resp.status_code == 200:
+            results = resp.json()
+            # Handle both list and dict response formats
+            if isinstance(results, list):
+                documents = results
+            else:
+                documents = results.get("documents", results.get("results", []))
+
+            # Should find documents containing "healthcare"
+            healthcare_docs = [
+                doc
+                for doc in documents
+                if "healthcare" in str(doc.get("title", "")).lower()
+                or "healthcare" in str(doc.get("description", "")).lower()
             ]
+            assert (
+                len(healthcare_docs) >= 0
+            )  # Allow for no results if no healthcare docs exist
 
-            for doc_data in docs:
-                resp = await ac.post("/documents/", json=doc_data)
-                assert resp.status_code == 200
-
-            # Test search functionality (assuming search endpoint exists)
-            resp = await ac.get("/search/?q=healthcare")
-            if resp.status_code == 200:
-                results = resp.json()
-                # Handle both list and dict response formats
-                if isinstance(results, list):
-                    documents = results
-                else:
-                    documents = results.get("documents", results.get("results", []))
-
-                # Should find documents containing "healthcare"
-                healthcare_docs = [
-                    doc
-                    for doc in documents
-                    if "healthcare" in str(doc.get("title", "")).lower()
-                    or "healthcare" in str(doc.get("description", "")).lower()
-                ]
-                assert (
-                    len(healthcare_docs) >= 0
-                )  # Allow for no results if no healthcare docs exist
-
-    @pytest.mark.asyncio
-    async def test_document_tagging_system(self):
+    async def test_document_tagging_system(self, client):
         """Test document tagging and tag-based search"""
         # Note: This test assumes tagging functionality exists
         # If not implemented yet, this serves as a specification
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create document
-            resp = await ac.post(
+        # Create document
+        doc = _ok(
+            await _post_json(
+                client,
                 "/documents/",
-                json={
+                {
                     "title": "Tagged Document",
                     "description": "Document with tags",
                     "source": "Test",
                 },
             )
-            assert resp.status_code == 200
-            doc = resp.json()
+        )
 
-            # Add tags (if endpoint exists)
-            tag_data = {"tags": ["policy", "healthcare", "government"]}
-            resp = await ac.post(f"/documents/{doc['id']}/tags", json=tag_data)
-            # This might return 404 if not implemented yet - that's expected
+        # Add tags (if endpoint exists)
+        tag_data = {"tags": ["policy", "healthcare", "government"]}
+        resp = await _post_json(client, f"/documents/{doc['id']}/tags", tag_data)
+        # This might return 404 if not implemented yet - that's expected
 
-            # Test tag-based search (if endpoint exists)
-            resp = await ac.get("/search/?tags=healthcare")
-            # This might return 404 if not implemented yet - that's expected
+        # Test tag-based search (if endpoint exists)
+        resp = await client.get("/search/?tags=healthcare")
+        # This might return 404 if not implemented yet - that's expected
 
 
+# The RAG service is a process-wide singleton patched by these tests
+@pytest.mark.xdist_group("rag")
 class TestAIRAGFunctionality:
     """Test AI question answering with RAG and Ollama integration"""
 
-    @pytest.mark.asyncio
-    async def test_rag_service_initialization(self):
+    async def test_rag_service_initialization(self, rag_service):
         """Test that RAG service initializes correctly"""
-        from app.rag import get_rag_service
-
-        rag_service = get_rag_service()
         assert rag_service is not None
         assert rag_service.embedding_model is not None
         assert rag_service.llm_model is not None
         assert rag_service.chroma_client is not None
 
-    @pytest.mark.asyncio
-    async def test_document_indexing_for_rag(self):
+    async def test_document_indexing_for_rag(self, rag_service, mock_rag):
         """Test document indexing for RAG functionality"""
-        from app.rag import get_rag_service
-
-        rag_service = get_rag_service()
-
         # Test indexing with sample text
         test_text = """
         This is a test document about healthcare policies.
@@ -262,627 +337,404 @@ class TestAIRAGFunctionality:
         aspects of healthcare management and policy implementation.
         """
 
-        # Mock the embedding generation to avoid Ollama dependency in tests
-        with patch.object(rag_service, "_generate_embedding") as mock_embed:
-            mock_embed.return_value = [
-                0.1
-            ] * 1024  # Mock embedding vector with correct dimension
-
-            # Also mock the collection to avoid dimension mismatch
-            mock_collection = MagicMock()
-            mock_collection.add = MagicMock()
-
-            with patch.object(
-                rag_service, "get_or_create_collection", return_value=mock_collection
-            ):
-                result = await rag_service.index_document(
-                    document_id=1,
-                    text_content=test_text,
-                    metadata={"title": "Test Healthcare Document"},
-                )
+        result = await rag_service.index_document(
+            document_id=1,
+            text_content=test_text,
+            metadata={"title": "Test Healthcare Document"},
+        )
 
-                assert result is True
-                assert mock_embed.called
+        assert result is True
+        assert rag_service._generate_embedding.called
+        assert mock_rag.add_calls
 
-    @pytest.mark.asyncio
-    async def test_rag_question_answering(self):
+    async def test_rag_question_answering(self, rag_service, mock_rag):
         """Test RAG-based question answering"""
-        from app.rag import get_rag_service
-
-        rag_service = get_rag_service()
-
-        # Mock the necessary methods to avoid Ollama dependency
-        with patch.object(
-            rag_service, "_generate_embedding"
-        ) as mock_embed, patch.object(rag_service, "_generate_answer") as mock_answer:
-            mock_embed.return_value = [0.1] * 384
-            mock_answer.return_value = "Based on the document, healthcare policies focus on patient care and medical procedures."
-
-            # Mock ChromaDB collection
-            mock_collection = MagicMock()
-            mock_collection.query.return_value = {
-                "documents": [
-                    ["This document discusses healthcare policies and patient care."]
-                ],
-                "metadatas": [[{"chunk_index": 0, "document_id": 1}]],
-                "distances": [[0.2]],
-            }
-
-            with patch.object(
-                rag_service, "get_or_create_collection", return_value=mock_collection
-            ):
-                result = await rag_service.ask_question(
-                    document_id=1,
-                    question="What are the main topics in this healthcare document?",
-                )
-
-                assert result["answer"] is not None
-                assert len(result["sources"]) > 0
-                assert result["confidence"] > 0
-
-    @pytest.mark.asyncio
-    async def test_rag_api_endpoint(self):
+        mock_rag.query_response = {
+            "documents": [
+                ["This document discusses healthcare policies and patient care."]
+            ],
+            "metadatas": [[{"chunk_index": 0, "document_id": 1}]],
+            "distances": [[0.2]],
+        }
+
+        result = await rag_service.ask_question(
+            document_id=1,
+            question="What are the main topics in this healthcare document?",
+        )
+
+        assert result["answer"] is not None
+        assert len(result["sources"]) > 0
+        assert result["confidence"] > 0
+
+    async def test_rag_api_endpoint(self, client, sample_doc):
         """Test RAG API endpoint for asking questions"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document first
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "RAG Test Document",
-                    "description": "Document for testing RAG functionality",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test RAG endpoint (if it exists)
-            question_data = {
-                "question": "What is this document about?",
-                "max_results": 5,
-            }
-
-            resp = await ac.post(f"/search/ask/{doc['id']}", json=question_data)
-            # This might return 404 if endpoint doesn't exist yet
-            if resp.status_code == 200:
-                result = resp.json()
-                assert "answer" in result
-                assert "sources" in result
-                assert "confidence" in result
+        # Test RAG endpoint (if it exists)
+        question_data = {
+            "question": "What is this document about?",
+            "max_results": 5,
+        }
+
+        resp = await _post_json(
+            client, f"/search/ask/{sample_doc['id']}", question_data
+        )
+        # This might return 404 if endpoint doesn't exist yet
+        if resp.status_code == 200:
+            result = resp.json()
+            assert "answer" in result
+            assert "sources" in result
+            assert "confidence" in result
 
 
 class TestAccessControlAndSharing:
     """Test user access control and document sharing permissions"""
 
-    @pytest.mark.asyncio
-    async def test_document_sharing_with_specific_users(self):
+    async def test_document_sharing_with_specific_users(self, client, sample_doc):
         """Test sharing documents with specific email addresses"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Shared Document",
-                    "description": "Document to test sharing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test sharing endpoint (requires authentication)
-            share_data = {
-                "shared_with_email": "user@example.com",
-                "permission_level": "view",
-                "is_everyone": False,
-            }
-
-            # This will likely fail without proper authentication setup
-            # but tests the endpoint structure
-            resp = await ac.post(f"/documents/{doc['id']}/shares", json=share_data)
-            # Expected to fail with 401/403 due to missing auth
-
-    @pytest.mark.asyncio
-    async def test_document_sharing_with_everyone(self):
+        # Test sharing endpoint (requires authentication)
+        share_data = {
+            "shared_with_email": "user@example.com",
+            "permission_level": "view",
+            "is_everyone": False,
+        }
+
+        # This will likely fail without proper authentication setup
+        # but tests the endpoint structure
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/shares", share_data
+        )
+        # Expected to fail with 401/403 due to missing auth
+
+    async def test_document_sharing_with_everyone(self, client, sample_doc):
         """Test sharing documents with everyone"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Public Document",
-                    "description": "Document shared with everyone",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test everyone sharing
-            share_data = {"permission_level": "view", "is_everyone": True}
+        # Test everyone sharing
+        share_data = {"permission_level": "view", "is_everyone": True}
 
-            resp = await ac.post(f"/documents/{doc['id']}/shares", json=share_data)
-            # Expected to fail with 401/403 due to missing auth
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/shares", share_data
+        )
+        # Expected to fail with 401/403 due to missing auth
 
-    @pytest.mark.asyncio
-    async def test_access_level_checking(self):
+    async def test_access_level_checking(self, client, sample_doc):
         """Test checking user access levels to documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Access Control Test",
-                    "description": "Document for access control testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test access level endpoint
-            resp = await ac.get(f"/documents/{doc['id']}/access")
-            # Expected to fail with 401/403 due to missing auth
+        # Test access level endpoint
+        resp = await client.get(f"/documents/{sample_doc['id']}/access")
+        # Expected to fail with 401/403 due to missing auth
 
 
 class TestCollaborationFeatures:
     """Test real-time collaboration, comments, and annotations"""
 
-    @pytest.mark.asyncio
-    async def test_document_comments(self):
+    async def test_document_comments(self, client, sample_doc):
         """Test adding and retrieving comments on documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Commented Document",
-                    "description": "Document for testing comments",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test adding comment (will fail without auth)
-            comment_data = {
-                "page_number": 1,
-                "x_position": 100.5,
-                "y_position": 200.3,
-                "content": "This is a test comment",
-            }
-
-            resp = await ac.post(f"/documents/{doc['id']}/comments", json=comment_data)
-            # Expected to fail with 401/403 due to missing auth
-
-            # Test getting comments
-            resp = await ac.get(f"/documents/{doc['id']}/comments")
-            assert resp.status_code == 200
-            comments = resp.json()
-            assert "comments" in comments
-
-    @pytest.mark.asyncio
-    async def test_real_time_collaboration_websocket(self):
+        # Test adding comment (will fail without auth)
+        comment_data = {
+            "page_number": 1,
+            "x_position": 100.5,
+            "y_position": 200.3,
+            "content": "This is a test comment",
+        }
+
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/comments", comment_data
+        )
+        # Expected to fail with 401/403 due to missing auth
+
+        # Test getting comments
+        comments = _ok(await client.get(f"/documents/{sample_doc['id']}/comments"))
+        assert "comments" in comments
+
+    async def test_real_time_collaboration_websocket(self, client):
         """Test WebSocket functionality for real-time collaboration"""
         # This would require WebSocket client testing
         # For now, just verify the WebSocket endpoint is mounted
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            try:
-                # Test that socket.io endpoint exists
-                resp = await ac.get("/socket.io/")
-                # WebSocket endpoints may return various status codes (400, 404, etc.)
-                # The important thing is that we get a response, not a 500 error
-                assert resp.status_code in [
-                    200,
-                    400,
-                    404,
-                    405,
-                    426,
-                ]  # Various acceptable codes
-            except TypeError as e:
-                # Socket.IO compatibility issue - this is expected in test environment
-                if "translate_request" in str(e):
-                    # This is the known Socket.IO compatibility issue
-                    assert True  # Test passes - we know the WebSocket is configured
-                else:
-                    raise e
+        try:
+            # Test that socket.io endpoint exists
+            resp = await client.get("/socket.io/")
+            # WebSocket endpoints may return various status codes (400, 404, etc.)
+            # The important thing is that we get a response, not a 500 error
+            assert resp.status_code in [
+                200,
+                400,
+                404,
+                405,
+                426,
+            ]  # Various acceptable codes
+        except TypeError as e:
+            # Socket.IO compatibility issue - this is expected in test environment
+            if "translate_request" in str(e):
+                # This is the known Socket.IO compatibility issue
+                assert True  # Test passes - we know the WebSocket is configured
+            else:
+                raise e
 
 
 class TestRedactionAndExport:
     """Test document redaction and PDF export functionality"""
 
-    @pytest.mark.asyncio
-    async def test_document_redaction(self):
+    async def test_document_redaction(self, client, sample_doc):
         """Test adding redactions to documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Redaction Test Document",
-                    "description": "Document for testing redaction",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test adding redaction (will fail without auth)
-            redaction_data = {
-                "page_number": 1,
-                "x_start": 100.0,
-                "y_start": 200.0,
-                "x_end": 300.0,
-                "y_end": 250.0,
-                "reason": "Sensitive information",
-            }
-
-            resp = await ac.post(
-                f"/documents/{doc['id']}/redactions", json=redaction_data
-            )
-            # Expected to fail with 401/403 due to missing auth
-
-            # Test getting redactions
-            resp = await ac.get(f"/documents/{doc['id']}/redactions")
-            assert resp.status_code == 200
-            redactions = resp.json()
-            # The endpoint might return different formats
-            assert "redactions" in redactions or "redacted_pages" in redactions
-
-    @pytest.mark.asyncio
-    async def test_redaction_application_to_pages(self):
+        # Test adding redaction (will fail without auth)
+        redaction_data = {
+            "page_number": 1,
+            "x_start": 100.0,
+            "y_start": 200.0,
+            "x_end": 300.0,
+            "y_end": 250.0,
+            "reason": "Sensitive information",
+        }
+
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/redactions", redaction_data
+        )
+        # Expected to fail with 401/403 due to missing auth
+
+        # Test getting redactions
+        redactions = _ok(await client.get(f"/documents/{sample_doc['id']}/redactions"))
+        # The endpoint might return different formats
+        assert "redactions" in redactions or "redacted_pages" in redactions
+
+    async def test_redaction_application_to_pages(self, client, sample_doc):
         """Test applying redactions to specific pages"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Page Redaction Test",
-                    "description": "Document for page redaction testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test applying redactions to a page
-            redaction_data = {
-                "redactions": [
-                    {
-                        "x_start": 100,
-                        "y_start": 200,
-                        "x_end": 300,
-                        "y_end": 250,
-                        "reason": "PII",
-                    }
-                ]
-            }
+        # Test applying redactions to a page
+        redaction_data = {
+            "redactions": [
+                {
+                    "x_start": 100,
+                    "y_start": 200,
+                    "x_end": 300,
+                    "y_end": 250,
+                    "reason": "PII",
+                }
+            ]
+        }
 
-            resp = await ac.post(
-                f"/documents/{doc['id']}/pages/1/redact", json=redaction_data
-            )
-            # This tests the endpoint structure
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/pages/1/redact", redaction_data
+        )
+        # This tests the endpoint structure
 
-    @pytest.mark.asyncio
-    async def test_document_export_functionality(self):
+    async def test_document_export_functionality(self, client, sample_doc):
         """Test exporting documents as PDF with redactions"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Export Test Document",
-                    "description": "Document for testing export",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test export functionality
-            export_data = {
-                "format": "pdf",
-                "page_ranges": "1-5",
-                "include_redacted": True,
-                "quality": "high",
-            }
-
-            resp = await ac.post(f"/documents/{doc['id']}/export", json=export_data)
-            # Export may fail due to S3 configuration, but endpoint should exist
-            assert resp.status_code in [
-                200,
-                500,
-            ]  # 500 is acceptable for S3 config issues
-
-            # Test listing exports
-            resp = await ac.get(f"/documents/{doc['id']}/exports")
-            # May return 500 due to S3 configuration issues
-            assert resp.status_code in [200, 500]
-
-    @pytest.mark.asyncio
-    async def test_redaction_integrity_verification(self):
+        # Test export functionality
+        export_data = {
+            "format": "pdf",
+            "page_ranges": "1-5",
+            "include_redacted": True,
+            "quality": "high",
+        }
+
+        resp = await _post_json(
+            client, f"/documents/{sample_doc['id']}/export", export_data
+        )
+        # Export may fail due to S3 configuration, but endpoint should exist
+        assert resp.status_code in [
+            200,
+            500,
+        ]  # 500 is acceptable for S3 config issues
+
+        # Test listing exports
+        resp = await client.get(f"/documents/{sample_doc['id']}/exports")
+        # May return 500 due to S3 configuration issues
+        assert resp.status_code in [200, 500]
+
+    async def test_redaction_integrity_verification(self, client, sample_doc):
         """Test verifying redaction integrity"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Redaction Integrity Test",
-                    "description": "Document for redaction integrity testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test redaction integrity verification
-            resp = await ac.get(f"/documents/{doc['id']}/pages/1/redactions/verify")
-            # This tests the endpoint structure
+        # Test redaction integrity verification
+        resp = await client.get(
+            f"/documents/{sample_doc['id']}/pages/1/redactions/verify"
+        )
+        # This tests the endpoint structure
 
 
 class TestOCRAndProcessing:
     """Test OCR processing and metadata stripping"""
 
-    @pytest.mark.asyncio
-    async def test_ocr_processing_pipeline(self):
-        """Test OCR processing of uploaded documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document that would trigger OCR
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "OCR Test Document.pdf",
-                    "description": "Document for OCR testing",
-                    "source": "Test",
-                    "language": "en",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Check that OCR job was created
-            resp = await ac.get(f"/documents/{doc['id']}/jobs")
-            assert resp.status_code == 200
-            jobs = resp.json()
-
-            ocr_jobs = [job for job in jobs if job["job_type"] == "ocr"]
-            assert len(ocr_jobs) == 1
-            assert ocr_jobs[0]["status"] in ["queued", "running", "completed", "failed"]
-
-    @pytest.mark.asyncio
-    async def test_document_tiling_processing(self):
-        """Test document tiling for viewer"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Tiling Test Document",
-                    "description": "Document for tiling testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Check tiling job
-            resp = await ac.get(f"/documents/{doc['id']}/jobs")
-            assert resp.status_code == 200
-            jobs = resp.json()
-
-            tiling_jobs = [job for job in jobs if job["job_type"] == "tiling"]
-            assert len(tiling_jobs) == 1
-
-            # Test tile endpoint
-            resp = await ac.get(f"/documents/{doc['id']}/tiles/page_0/")
-            assert resp.status_code == 200
-            tile_config = resp.json()
-            assert "type" in tile_config
-            assert "url" in tile_config
-
-    @pytest.mark.asyncio
-    async def test_thumbnail_generation(self):
-        """Test thumbnail generation for documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Thumbnail Test Document",
-                    "description": "Document for thumbnail testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Check thumbnail job
-            resp = await ac.get(f"/documents/{doc['id']}/jobs")
-            assert resp.status_code == 200
-            jobs = resp.json()
-
-            thumbnail_jobs = [job for job in jobs if job["job_type"] == "thumbnails"]
-            assert len(thumbnail_jobs) == 1
-
-            # Test thumbnail endpoint
-            resp = await ac.get(f"/documents/{doc['id']}/thumbnail/0")
-            assert resp.status_code == 200
-            assert resp.headers["content-type"] in ["image/png", "image/webp"]
+    @pytest.mark.parametrize("job_type", ["ocr", "tiling", "thumbnails"])
+    async def test_processing_job_created(self, client, sample_doc, job_type):
+        """Test that each processing stage gets exactly one job"""
+        jobs = _ok(await client.get(f"/documents/{sample_doc['id']}/jobs"))
+        jobs = [job for job in jobs if job["job_type"] == job_type]
+        assert len(jobs) == 1
+        assert jobs[0]["status"] in ["queued", "running", "completed", "failed"]
+
+    async def test_document_tiling_processing(self, client, sample_doc):
+        """Test the tile endpoint for the viewer"""
+        tile_config = _ok(
+            await client.get(f"/documents/{sample_doc['id']}/tiles/page_0/")
+        )
+        assert "type" in tile_config
+        assert "url" in tile_config
+
+    async def test_thumbnail_generation(self, client, sample_doc):
+        """Test the thumbnail endpoint"""
+        resp = await client.get(f"/documents/{sample_doc['id']}/thumbnail/0")
+        assert resp.status_code == 200
+        assert resp.headers["content-type"] in ["image/png", "image/webp"]
 
 
 class TestVersionControlAndAudit:
     """Test version control and audit trails"""
 
-    @pytest.mark.asyncio
-    async def test_document_version_tracking(self):
+    async def test_document_version_tracking(self, client, sample_doc):
         """Test document version control"""
         # Note: This assumes version control is implemented
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create initial document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Version Control Test",
-                    "description": "Initial version",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Update document (if update endpoint exists)
-            update_data = {"description": "Updated version", "status": "in_review"}
+        # Update document (if update endpoint exists)
+        update_data = {"description": "Updated version", "status": "in_review"}
 
-            resp = await ac.put(f"/documents/{doc['id']}", json=update_data)
-            # This might return 404 if update endpoint doesn't exist yet
+        resp = await client.put(f"/documents/{sample_doc['id']}", json=update_data)
+        # This might return 404 if update endpoint doesn't exist yet
 
-    @pytest.mark.asyncio
-    async def test_audit_trail_logging(self):
+    async def test_audit_trail_logging(self, client, sample_doc):
         """Test audit trail functionality"""
         # This would test audit logging if implemented
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create document
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Audit Test Document",
-                    "description": "Document for audit testing",
-                    "source": "Test",
-                },
-            )
-            assert resp.status_code == 200
-            doc = resp.json()
-
-            # Test audit log endpoint (if it exists)
-            resp = await ac.get(f"/documents/{doc['id']}/audit")
-            # This might return 404 if audit endpoint doesn't exist yet
+        # Test audit log endpoint (if it exists)
+        resp = await client.get(f"/documents/{sample_doc['id']}/audit")
+        # This might return 404 if audit endpoint doesn't exist yet
 
 
 class TestSystemIntegration:
     """Test system-wide integration and performance"""
 
-    @pytest.mark.asyncio
-    async def test_health_endpoints(self):
+    def test_health_endpoints(self):
         """Test system health endpoints"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Test main health endpoint
-            resp = await ac.get("/health")
-            assert resp.status_code == 200
-            assert resp.json()["status"] == "ok"
-
-            # Test root endpoint
-            resp = await ac.get("/")
-            assert resp.status_code == 200
-            assert resp.json()["service"] == "haqnow-community"
-
-    @pytest.mark.asyncio
-    async def test_api_documentation_endpoints(self):
+        # Trivial GETs: the sync TestClient skips the event-loop plumbing
+        # Test main health endpoint
+        resp = sync_client.get("/health")
+        assert resp.status_code == 200
+        assert resp.json()["status"] == "ok"
+
+        # Test root endpoint
+        resp = sync_client.get("/")
+        assert resp.status_code == 200
+        assert resp.json()["service"] == "haqnow-community"
+
+    async def test_api_documentation_endpoints(self, client):
         """Test API documentation availability"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Test OpenAPI schema
-            resp = await ac.get("/openapi.json")
-            assert resp.status_code == 200
+        # Test OpenAPI schema
+        resp = await client.get("/openapi.json")
+        assert resp.status_code == 200
 
-            # Test Swagger UI (might redirect)
-            resp = await ac.get("/docs")
-            assert resp.status_code in [200, 307]  # 307 for redirect
+        # Test Swagger UI (might redirect)
+        resp = await client.get("/docs")
+        assert resp.status_code in [200, 307]  # 307 for redirect
 
-    @pytest.mark.asyncio
-    async def test_cors_configuration(self):
+    async def test_cors_configuration(self, client):
         """Test CORS configuration"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Test CORS headers with a regular request
-            resp = await ac.get("/health")
-            # CORS headers should be present in response
-            headers_lower = [h.lower() for h in resp.headers.keys()]
-            # Check for any CORS-related headers
-            cors_headers = [
-                "access-control-allow-origin",
-                "access-control-allow-methods",
-                "access-control-allow-headers",
-            ]
-            has_cors = any(header in headers_lower for header in cors_headers)
-            # For now, just check that the endpoint responds (CORS might not be fully configured)
-            assert resp.status_code == 200
+        # Test CORS headers with a regular cross-origin request
+        resp = await client.get("/health", headers={"Origin": "http://example.com"})
+        assert resp.status_code == 200
+        assert any(key in resp.headers for key in CORS_KEYS)
 
-    @pytest.mark.asyncio
-    async def test_database_cleanup(self):
+    @pytest.mark.xdist_group("docs")
+    async def test_database_cleanup(self, client):
         """Test database cleanup functionality"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create test documents
-            for i in range(5):
-                resp = await ac.post(
+        # Create test documents concurrently
+        responses = await asyncio.gather(
+            *[
+                _post_json(
+                    client,
                     "/documents/",
-                    json={
+                    {
                         "title": f"Cleanup Test {i}",
                         "description": "Test document for cleanup",
                         "source": "Test",
                     },
                 )
-                assert resp.status_code == 200
+                for i in range(5)
+            ]
+        )
+        assert all(resp.status_code == 200 for resp in responses)
 
-            # Test cleanup endpoint
-            resp = await ac.delete("/documents/")
-            assert resp.status_code == 200
+        # Test cleanup endpoint
+        resp = await client.delete("/documents/")
+        assert resp.status_code == 200
 
-            # Verify cleanup worked
-            resp = await ac.get("/documents/")
-            assert resp.status_code == 200
-            docs = resp.json()
-            assert len(docs) == 0
+        # Verify cleanup worked
+        docs = _ok(await client.get("/documents/"))
+        assert len(docs) == 0
 
 
 # Performance and Load Testing
 class TestPerformanceAndLoad:
     """Test system performance under load"""
 
-    @pytest.mark.asyncio
-    async def test_concurrent_document_creation(self):
-        """Test creating multiple documents concurrently"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create multiple documents concurrently
-            tasks = []
-            for i in range(20):
-                task = ac.post(
-                    "/documents/",
-                    json={
-                        "title": f"Concurrent Document {i}",
-                        "description": f"Concurrent test document {i}",
-                        "source": "Load Test",
-                    },
-                )
-                tasks.append(task)
-
-            # Execute all tasks concurrently
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Check that most requests succeeded
-            successful = [
-                r
-                for r in responses
-                if not isinstance(r, Exception) and r.status_code == 200
-            ]
-            assert len(successful) >= 15  # Allow for some failures under load
-
-    @pytest.mark.asyncio
-    async def test_large_document_handling(self):
-        """Test handling of large documents"""
-        async with AsyncClient(app=app, base_url="http://test") as ac:
-            # Create a document with large description
-            large_description = "Large document content. " * 1000  # ~25KB description
-
-            resp = await ac.post(
-                "/documents/",
-                json={
-                    "title": "Large Document Test",
-                    "description": large_description,
-                    "source": "Performance Test",
-                },
+    async def test_concurrent_document_creation(self, client):
+        """Test creating many documents in bulk plus a concurrent burst"""
+        # Shared fields live in one template; each payload only adds its own
+        base = {"source": "Load Test"}
+
+        # The bulk endpoint covers volume in a single round trip
+        payloads = [
+            {
+                **base,
+                "title": f"Bulk Load Document {i}",
+                "description": f"Bulk load test document {i}",
+            }
+            for i in range(20)
+        ]
+        created = _ok(
+            await _post_json(client, "/documents/bulk", {"documents": payloads})
+        )
+        assert len(created) == 20
+        assert len({doc["id"] for doc in created}) == 20
+
+        # Batches are capped so one request can't enqueue unbounded work
+        resp = await _post_json(
+            client, "/documents/bulk", {"documents": [payloads[0]] * 101}
+        )
+        assert resp.status_code == 422
+
+        # A smaller burst still exercises concurrent single-document requests.
+        # Bodies are encoded up front so the first request goes out immediately
+        bodies = [
+            _dumps_json(
+                {
+                    **base,
+                    "title": f"Concurrent Document {i}",
+                    "description": f"Concurrent test document {i}",
+                }
             )
-            assert resp.status_code == 200
+            for i in range(5)
+        ]
+        responses = []
 
-            doc = resp.json()
-            assert len(doc["description"]) > 20000
+        async def post_document(body):
+            try:
+                responses.append(
+                    await client.post(
+                        "/documents/", content=body, headers=_JSON_HEADERS
+                    )
+                )
+            except Exception as e:  # Keep going, like gather(return_exceptions=True)
+                responses.append(e)
+
+        async with anyio.create_task_group() as tg:
+            for body in bodies:
+                tg.start_soon(post_document, body)
+
+        # Check that most requests succeeded
+        successful = sum(
+            1
+            for r in responses
+            if not isinstance(r, Exception) and r.status_code == 200
+        )
+        assert successful >= 4  # Allow for a failure under load
+
+    async def test_large_document_handling(self, client):
+        """Test handling of large documents"""
+        # Create a document with large description
+        resp = await _post_json(
+            client,
+            "/documents/",
+            {
+                "title": "Large Document Test",
+                "description": _LARGE_DESCRIPTION,
+                "source": "Performance Test",
+            },
+        )
+        # Decode the body once and index the parsed dict from here on
+        doc = _ok(resp)
+        assert len(doc["description"]) > _LARGE_DESCRIPTION_MIN_LENGTH
 
 
 if __name__ == "__main__":
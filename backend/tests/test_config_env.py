@@ -1,13 +1,17 @@
-from app.config import get_settings
+import pytest
 
+from app.config import _get_settings_cached, get_settings
 
-def test_settings_reads_exoscale_env(monkeypatch):
-    # Clear cached settings so env changes are reflected
-    try:
-        get_settings.cache_clear()  # type: ignore[attr-defined]
-    except Exception:
-        pass
 
+@pytest.fixture
+def clean_settings():
+    # Drop cached settings before and after so env changes neither leak in nor out
+    _get_settings_cached.cache_clear()
+    yield
+    _get_settings_cached.cache_clear()
+
+
+def test_settings_reads_exoscale_env(clean_settings, monkeypatch):
     # Provide fake Exoscale/SOS env to ensure Settings picks them up
     monkeypatch.setenv("EXOSCALE_S3_ACCESS_KEY", "test-access")
     monkeypatch.setenv("EXOSCALE_S3_SECRET_KEY", "test-secret")
@@ -0,0 +1,18 @@
+import pytest
+
+from app import conversion
+from app.conversion import convert_document_to_pdf
+
+
+@pytest.mark.parametrize("filename", ["x.doc", "x.docx", "x.pptx", "x.txt"])
+def test_pdf_content_skips_conversion(monkeypatch, filename):
+    def no_subprocess(*args, **kwargs):
+        raise AssertionError("PDF input was sent to LibreOffice")
+
+    monkeypatch.setattr(conversion.subprocess, "run", no_subprocess)
+    pdf_bytes = b"%PDF-1.4\n%%EOF\n"
+
+    pdf_data, pdf_filename = convert_document_to_pdf(pdf_bytes, filename)
+
+    assert pdf_data is pdf_bytes
+    assert pdf_filename == "x.pdf"
@@ -1,57 +1,66 @@
 import pytest
-from app.main import app
-from httpx import AsyncClient
-
-
-@pytest.mark.asyncio
-async def test_document_creation():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        # Clean up existing documents first
-        await ac.delete("/documents/")
-
-        # Create document
-        resp = await ac.post(
-            "/documents/",
-            json={
-                "title": "Test Document",
-                "description": "A test document",
-                "source": "Test Source",
-                "language": "en",
-            },
-        )
-        assert resp.status_code == 200
-        data = resp.json()
-        assert data["title"] == "Test Document"
-        assert data["status"] == "new"
-        assert data["uploader_id"] == 1
-
-        doc_id = data["id"]
-
-        # Get document
-        resp = await ac.get(f"/documents/{doc_id}")
-        assert resp.status_code == 200
-        doc = resp.json()
-        assert doc["title"] == "Test Document"
-
-        # List documents
-        resp = await ac.get("/documents/")
-        assert resp.status_code == 200
-        docs = resp.json()
-        assert len(docs) == 1
-        assert docs[0]["title"] == "Test Document"
-
-
-@pytest.mark.asyncio
-async def test_presigned_upload():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        # Note: This will fail without S3 credentials, but tests the endpoint structure
-        resp = await ac.post(
-            "/documents/presigned-upload",
-            json={
-                "filename": "test.pdf",
-                "content_type": "application/pdf",
-                "size": 1024,
-            },
-        )
-        # In some environments, a local/mock implementation may return 200; accept both
-        assert resp.status_code in (200, 400)
+
+
+@pytest.mark.xdist_group("docs")
+async def test_document_creation(client):
+    # Clean up existing documents first
+    await client.delete("/documents/")
+
+    # Create document
+    resp = await client.post(
+        "/documents/",
+        json={
+            "title": "Test Document",
+            "description": "A test document",
+            "source": "Test Source",
+            "language": "en",
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["title"] == "Test Document"
+    assert data["status"] == "new"
+    assert data["uploader_id"] == 1
+
+    doc_id = data["id"]
+
+    # Get document
+    resp = await client.get(f"/documents/{doc_id}")
+    assert resp.status_code == 200
+    doc = resp.json()
+    assert doc["title"] == "Test Document"
+
+    # List documents
+    resp = await client.get("/documents/")
+    assert resp.status_code == 200
+    docs = resp.json()
+    assert len(docs) == 1
+    assert docs[0]["title"] == "Test Document"
+
+
+async def test_presigned_upload(client, monkeypatch):
+    # Stub the SOS presigner so the test covers the success path without credentials
+    def fake_presigned_upload(filename, content_type, size):
+        return {
+            "upload_id": f"uploads/{filename}",
+            "upload_url": "https://sos-ch-gva-2.exo.io/originals",
+            "fields": {"key": f"uploads/{filename}", "Content-Type": content_type},
+        }
+
+    monkeypatch.setattr(
+        "app.routes_documents.generate_presigned_upload", fake_presigned_upload
+    )
+
+    resp = await client.post(
+        "/documents/presigned-upload",
+        json={
+            "filename": "test.pdf",
+            "content_type": "application/pdf",
+            "size": 1024,
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["upload_id"] == "uploads/test.pdf"
+    assert data["upload_url"].startswith("https://")
+    assert data["fields"]["Content-Type"] == "application/pdf"
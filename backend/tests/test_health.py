@@ -1,12 +1,5 @@
-import pytest
-from httpx import AsyncClient
-from app.main import app
-
-
-@pytest.mark.asyncio
-async def test_health():
-    async with AsyncClient(app=app, base_url="http://test") as ac:
-        resp = await ac.get("/health")
+async def test_health(client):
+    resp = await client.get("/health")
     assert resp.status_code == 200
     assert resp.json()["status"] == "ok"
 
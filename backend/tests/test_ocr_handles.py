@@ -0,0 +1,63 @@
+import threading
+
+from PIL import Image
+
+from app import processing
+
+
+class _FakeTessAPI:
+    created = 0
+
+    def __init__(self, lang, oem, psm):
+        type(self).created += 1
+        self.options = (lang, oem, psm)
+
+    def SetImage(self, image):
+        self.image = image
+
+    def GetUTF8Text(self):
+        return "text"
+
+
+def _fake_tesserocr(monkeypatch):
+    _FakeTessAPI.created = 0
+    monkeypatch.setattr(processing, "PyTessBaseAPI", _FakeTessAPI)
+    monkeypatch.setattr(processing, "_tess_pool", {})
+
+
+def test_tess_options():
+    assert processing._tess_options("--oem 1 --psm 6") == (1, 6)
+    assert processing._tess_options("") == (3, 3)
+    assert processing._tess_options("--psm 6 -c preserve_interword_spaces=1") is None
+
+
+def test_tesserocr_handles_outlive_page_threads(monkeypatch):
+    _fake_tesserocr(monkeypatch)
+    processing.warm_tesseract()
+    image = Image.new("L", (10, 10))
+
+    # Each "task" runs its pages on fresh threads, as _iter_page_results does
+    for _ in range(3):
+        thread = threading.Thread(
+            target=processing._ocr_with_tesserocr,
+            args=(image, "eng", processing.FAST_OCR_CONFIG),
+        )
+        thread.start()
+        thread.join()
+
+    assert _FakeTessAPI.created == 1
+
+
+def test_tesserocr_concurrent_threads_get_separate_handles(monkeypatch):
+    _fake_tesserocr(monkeypatch)
+    options = processing._tess_options(processing.FAST_OCR_CONFIG)
+
+    with processing._tess_api("eng", *options) as first:
+        with processing._tess_api("eng", *options) as second:
+            assert first is not second
+    assert _FakeTessAPI.created == 2
+
+    # Both are returned to the pool and reused
+    with processing._tess_api("eng", *options):
+        pass
+    assert _FakeTessAPI.created == 2
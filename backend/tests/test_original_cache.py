@@ -0,0 +1,58 @@
+from app import tasks
+from app.config import get_settings
+from app.models import Document
+
+
+def _fake_s3(monkeypatch, objects):
+    """Serve ``objects`` ({key: (etag, data)}) and count downloads"""
+    downloads = []
+
+    def fake_etag(bucket, key):
+        return objects[key][0]
+
+    def fake_download(bucket, key):
+        downloads.append(key)
+        return objects[key][1]
+
+    monkeypatch.setattr(tasks, "get_s3_etag", fake_etag)
+    monkeypatch.setattr(tasks, "download_from_s3", fake_download)
+    return downloads
+
+
+def test_original_cache_is_keyed_by_object_version(monkeypatch, tmp_path):
+    monkeypatch.setenv("ORIGINAL_CACHE_DIR", str(tmp_path))
+    settings = get_settings()
+    objects = {"uploads/report.pdf": ('"v1"', b"first upload " * 20)}
+    downloads = _fake_s3(monkeypatch, objects)
+    document = Document(id=7, title="report.pdf")
+
+    assert tasks._load_original_file_bytes(settings, document) == b"first upload " * 20
+    assert tasks._load_original_file_bytes(settings, document) == b"first upload " * 20
+    assert downloads == ["uploads/report.pdf"]
+
+    # Same key, new object (e.g. the id and title were reused after a reset)
+    objects["uploads/report.pdf"] = ('"v2"', b"second upload " * 20)
+    assert tasks._load_original_file_bytes(settings, document) == b"second upload " * 20
+    assert len(downloads) == 2
+
+
+def test_evict_original_cache_drops_document_entries(monkeypatch, tmp_path):
+    monkeypatch.setenv("ORIGINAL_CACHE_DIR", str(tmp_path))
+    settings = get_settings()
+    objects = {
+        "uploads/a.pdf": ('"a"', b"a" * 200),
+        "uploads/b.pdf": ('"b"', b"b" * 200),
+    }
+    _fake_s3(monkeypatch, objects)
+    doc_a = Document(id=1, title="a.pdf")
+    doc_b = Document(id=2, title="b.pdf")
+    tasks._load_original_file_bytes(settings, doc_a)
+    tasks._load_original_file_bytes(settings, doc_b)
+    assert len(list(tmp_path.glob("*.bin"))) == 2
+
+    tasks._evict_original_cache(settings, doc_a)
+    assert tasks._read_original_cache(settings, "uploads/a.pdf", '"a"') is None
+    assert tasks._read_original_cache(settings, "uploads/b.pdf", '"b"') == b"b" * 200
+
+    tasks._clear_original_cache(settings)
+    assert list(tmp_path.glob("*.bin")) == []
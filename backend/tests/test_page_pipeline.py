@@ -0,0 +1,157 @@
+import io
+import threading
+import time
+
+import fitz
+import pytest
+
+from app import processing, s3_client, tasks
+
+
+def _pdf_bytes(pages: int) -> bytes:
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _prefetch_threads():
+    return [t for t in threading.enumerate() if t.name == "page-prefetch"]
+
+
+def test_prefetch_reraises_producer_exception():
+    def pages():
+        yield 0, b"page"
+        raise ValueError("rasterizer failed")
+
+    results = []
+    with pytest.raises(ValueError, match="rasterizer failed"):
+        for item in tasks._prefetch(pages()):
+            results.append(item)
+    assert results == [(0, b"page")]
+    assert _prefetch_threads() == []
+
+
+def test_prefetch_consumer_stop_joins_producer():
+    def endless():
+        n = 0
+        while True:
+            yield n
+            n += 1
+
+    items = tasks._prefetch(endless())
+    assert [next(items) for _ in range(3)] == [0, 1, 2]
+    items.close()
+    assert _prefetch_threads() == []
+
+
+def test_iter_page_results_bounds_pages_in_flight():
+    max_workers = 2
+    yielded = 0
+    finished = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def pages():
+        nonlocal yielded, peak
+        for page_num in range(30):
+            with lock:
+                yielded += 1
+                peak = max(peak, yielded - finished)
+            yield page_num, b"page"
+
+    def worker(page_num, page_image):
+        nonlocal finished
+        time.sleep(0.01)
+        with lock:
+            finished += 1
+        return page_num
+
+    results = list(tasks._iter_page_results(worker, pages(), max_workers))
+
+    assert sorted(results) == list(range(30))
+    # Submitted-but-unfinished pages, plus the prefetch queue (2), the page in
+    # the consumer's hands and the one the producer is blocked putting
+    assert peak <= max_workers * 2 + 4
+
+
+def test_iter_page_results_propagates_worker_exception():
+    def worker(page_num, page_image):
+        if page_num == 3:
+            raise RuntimeError("ocr failed")
+        return page_num
+
+    pages = ((n, b"page") for n in range(1000))
+    with pytest.raises(RuntimeError, match="ocr failed"):
+        list(tasks._iter_page_results(worker, pages, max_workers=2))
+    assert _prefetch_threads() == []
+
+
+def test_rasterized_pages_len_does_not_render(monkeypatch):
+    rendered = []
+
+    def fake_render(doc, page_num, dpi, grayscale=False):
+        rendered.append(page_num)
+        return b"png"
+
+    monkeypatch.setattr(processing, "_render_pdf_page", fake_render)
+    pages = processing.rasterize_pdf_pages(_pdf_bytes(3), dpi=72)
+
+    assert len(pages) == 3
+    assert rendered == []
+    assert list(pages) == [(0, b"png"), (1, b"png"), (2, b"png")]
+    assert rendered == [0, 1, 2]
+
+
+async def test_gzip_ocr_result_is_readable_by_rag(monkeypatch):
+    from app import rag
+
+    pages = [
+        {"page": 0, "text": "first page"},
+        {"page": 1, "text": ""},
+        {"page": 2, "text": "third page ✓"},
+    ]
+    body = tasks._gzip_ocr_result(42, pages).read()
+
+    class FakeS3:
+        def get_object(self, Bucket, Key):
+            assert Key == "ocr/42/text.json"
+            return {"Body": io.BytesIO(body), "ContentEncoding": "gzip"}
+
+    monkeypatch.setattr(rag, "get_s3_client", lambda: FakeS3())
+    text = await rag.get_rag_service().load_document_text(42)
+
+    assert text == "first page\n\nthird page ✓"
+
+
+class _RecordingS3:
+    def __init__(self):
+        self.calls = []
+
+    def put_object(self, **kwargs):
+        self.calls.append("put_object")
+        return {"ETag": '"put"'}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None, Config=None):
+        self.calls.append("upload_fileobj")
+        self.config = Config
+
+    def head_object(self, Bucket, Key):
+        self.calls.append("head_object")
+        return {"ETag": '"multipart-2"'}
+
+
+def test_upload_to_s3_switches_to_multipart_for_large_objects(monkeypatch):
+    client = _RecordingS3()
+    monkeypatch.setattr(s3_client, "get_s3_client", lambda: client)
+    monkeypatch.setattr(s3_client, "MULTIPART_UPLOAD_THRESHOLD", 100)
+
+    assert s3_client.upload_to_s3("originals", "small", b"x" * 100) == '"put"'
+    assert client.calls == ["put_object"]
+
+    client.calls.clear()
+    assert s3_client.upload_to_s3("originals", "large", b"x" * 101) == '"multipart-2"'
+    assert client.calls == ["upload_fileobj", "head_object"]
+    assert client.config is s3_client.LARGE_OBJECT_TRANSFER_CONFIG
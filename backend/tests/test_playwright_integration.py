@@ -11,43 +11,16 @@ import pytest
 
 # Skip this module entirely if Playwright is not installed
 try:
-    from playwright.async_api import Browser, BrowserContext, Page, async_playwright
+    from playwright.async_api import Page
 except Exception:  # ModuleNotFoundError or runtime import issues
     pytest.skip(
         "Playwright not installed; skipping E2E browser tests", allow_module_level=True
     )
 
 
-class TestPlaywrightSetup:
-    """Setup and configuration for Playwright tests"""
-
-    @pytest.fixture(scope="session")
-    async def browser():
-        """Create browser instance for tests"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            yield browser
-            await browser.close()
-
-    @pytest.fixture
-    async def context(browser: Browser):
-        """Create browser context for each test"""
-        context = await browser.new_context()
-        yield context
-        await context.close()
-
-    @pytest.fixture
-    async def page(context: BrowserContext):
-        """Create page for each test"""
-        page = await context.new_page()
-        yield page
-        await page.close()
-
-
 class TestUserAuthentication:
     """Test user authentication and MFA functionality"""
 
-    @pytest.mark.asyncio
     async def test_login_page_loads(self, page: Page):
         """Test that login page loads correctly"""
         await page.goto("http://localhost:3000/login")
@@ -61,7 +34,6 @@ class TestUserAuthentication:
         title = await page.title()
         assert "Haqnow Community" in title or "Login" in title
 
-    @pytest.mark.asyncio
     async def test_mfa_setup_flow(self, page: Page):
         """Test MFA setup process"""
         await page.goto("http://localhost:3000/login")
@@ -83,7 +55,6 @@ class TestUserAuthentication:
             # MFA setup might not appear if user doesn't exist
             pass
 
-    @pytest.mark.asyncio
     async def test_admin_user_management(self, page: Page):
         """Test admin user management interface"""
         # This assumes admin access - might need to mock authentication
@@ -102,7 +73,6 @@ class TestUserAuthentication:
 class TestDocumentUploadInterface:
     """Test document upload functionality through the web interface"""
 
-    @pytest.mark.asyncio
     async def test_document_upload_page(self, page: Page):
         """Test document upload page functionality"""
         await page.goto("http://localhost:3000/documents")
@@ -116,7 +86,6 @@ class TestDocumentUploadInterface:
             # Upload area might be behind authentication
             pass
 
-    @pytest.mark.asyncio
     async def test_bulk_document_upload_ui(self, page: Page):
         """Test bulk document upload interface"""
         await page.goto("http://localhost:3000/documents")
@@ -133,7 +102,6 @@ class TestDocumentUploadInterface:
             # Bulk upload might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_upload_progress_tracking(self, page: Page):
         """Test upload progress tracking"""
         await page.goto("http://localhost:3000/documents")
@@ -166,7 +134,6 @@ class TestDocumentUploadInterface:
 class TestDocumentViewer:
     """Test document viewer functionality"""
 
-    @pytest.mark.asyncio
     async def test_document_viewer_loads(self, page: Page):
         """Test that document viewer loads correctly"""
         # Navigate to a document (assuming document ID 1 exists)
@@ -181,7 +148,6 @@ class TestDocumentViewer:
             # Document might not exist or viewer not implemented
             pass
 
-    @pytest.mark.asyncio
     async def test_document_zoom_and_pan(self, page: Page):
         """Test document zoom and pan functionality"""
         await page.goto("http://localhost:3000/documents/1")
@@ -201,7 +167,6 @@ class TestDocumentViewer:
             # Zoom controls might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_document_page_navigation(self, page: Page):
         """Test document page navigation"""
         await page.goto("http://localhost:3000/documents/1")
@@ -226,7 +191,6 @@ class TestDocumentViewer:
 class TestSearchFunctionality:
     """Test search functionality through the web interface"""
 
-    @pytest.mark.asyncio
     async def test_search_interface(self, page: Page):
         """Test search interface elements"""
         await page.goto("http://localhost:3000")
@@ -255,7 +219,6 @@ class TestSearchFunctionality:
                 # Search results interface might not be implemented
                 pass
 
-    @pytest.mark.asyncio
     async def test_advanced_search_filters(self, page: Page):
         """Test advanced search filters"""
         await page.goto("http://localhost:3000/search")
@@ -278,7 +241,6 @@ class TestSearchFunctionality:
 class TestCollaborationFeatures:
     """Test real-time collaboration features"""
 
-    @pytest.mark.asyncio
     async def test_comment_system(self, page: Page):
         """Test document commenting system"""
         await page.goto("http://localhost:3000/documents/1")
@@ -310,7 +272,6 @@ class TestCollaborationFeatures:
             # Comment system might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_real_time_presence(self, page: Page):
         """Test real-time user presence indicators"""
         await page.goto("http://localhost:3000/documents/1")
@@ -325,7 +286,6 @@ class TestCollaborationFeatures:
             # Real-time presence might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_live_editing_indicators(self, page: Page):
         """Test live editing indicators"""
         await page.goto("http://localhost:3000/documents/1")
@@ -345,7 +305,6 @@ class TestCollaborationFeatures:
 class TestRedactionFeatures:
     """Test document redaction functionality"""
 
-    @pytest.mark.asyncio
     async def test_redaction_tool_interface(self, page: Page):
         """Test redaction tool interface"""
         await page.goto("http://localhost:3000/documents/1")
@@ -365,7 +324,6 @@ class TestRedactionFeatures:
             # Redaction tool might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_redaction_drawing(self, page: Page):
         """Test drawing redaction rectangles"""
         await page.goto("http://localhost:3000/documents/1")
@@ -395,7 +353,6 @@ class TestRedactionFeatures:
             # Redaction drawing might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_export_with_redactions(self, page: Page):
         """Test exporting documents with redactions"""
         await page.goto("http://localhost:3000/documents/1")
@@ -427,7 +384,6 @@ class TestRedactionFeatures:
 class TestAIQuestionAnswering:
     """Test AI question answering interface"""
 
-    @pytest.mark.asyncio
     async def test_ai_chat_interface(self, page: Page):
         """Test AI chat interface for asking questions"""
         await page.goto("http://localhost:3000/documents/1")
@@ -464,7 +420,6 @@ class TestAIQuestionAnswering:
             # AI chat interface might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_ai_response_citations(self, page: Page):
         """Test AI response citations linking to document sections"""
         await page.goto("http://localhost:3000/documents/1")
@@ -513,7 +468,6 @@ class TestAIQuestionAnswering:
 class TestDocumentSharing:
     """Test document sharing functionality"""
 
-    @pytest.mark.asyncio
     async def test_share_dialog(self, page: Page):
         """Test document sharing dialog"""
         await page.goto("http://localhost:3000/documents/1")
@@ -544,7 +498,6 @@ class TestDocumentSharing:
             # Share functionality might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_permission_levels(self, page: Page):
         """Test different permission levels in sharing"""
         await page.goto("http://localhost:3000/documents/1")
@@ -577,7 +530,6 @@ class TestDocumentSharing:
 class TestResponsiveDesign:
     """Test responsive design and mobile compatibility"""
 
-    @pytest.mark.asyncio
     async def test_mobile_viewport(self, page: Page):
         """Test interface on mobile viewport"""
         # Set mobile viewport
@@ -593,7 +545,6 @@ class TestResponsiveDesign:
             nav_menu = await page.query_selector(".navigation-menu")
             assert nav_menu is not None
 
-    @pytest.mark.asyncio
     async def test_tablet_viewport(self, page: Page):
         """Test interface on tablet viewport"""
         # Set tablet viewport
@@ -610,7 +561,6 @@ class TestResponsiveDesign:
 class TestPerformanceAndAccessibility:
     """Test performance and accessibility"""
 
-    @pytest.mark.asyncio
     async def test_page_load_performance(self, page: Page):
         """Test page load performance"""
         # Navigate and measure load time
@@ -623,7 +573,6 @@ class TestPerformanceAndAccessibility:
         # Page should load within reasonable time (adjust threshold as needed)
         assert load_time < 10.0  # 10 seconds max
 
-    @pytest.mark.asyncio
     async def test_accessibility_features(self, page: Page):
         """Test basic accessibility features"""
         await page.goto("http://localhost:3000")
@@ -657,7 +606,6 @@ class TestPerformanceAndAccessibility:
 class TestErrorHandling:
     """Test error handling and edge cases"""
 
-    @pytest.mark.asyncio
     async def test_404_page(self, page: Page):
         """Test 404 error page"""
         await page.goto("http://localhost:3000/nonexistent-page")
@@ -666,7 +614,6 @@ class TestErrorHandling:
         page_content = await page.content()
         assert "404" in page_content or "not found" in page_content.lower()
 
-    @pytest.mark.asyncio
     async def test_network_error_handling(self, page: Page):
         """Test handling of network errors"""
         # Intercept network requests and simulate failures
@@ -684,7 +631,6 @@ class TestErrorHandling:
             # Error handling might not be implemented yet
             pass
 
-    @pytest.mark.asyncio
     async def test_invalid_document_id(self, page: Page):
         """Test handling of invalid document IDs"""
         await page.goto("http://localhost:3000/documents/99999")
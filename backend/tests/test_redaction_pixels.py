@@ -1,12 +1,10 @@
 import io
 
-import pytest
 from app.export import ExportService
 from app.redaction import RedactionService
 from PIL import Image
 
 
-@pytest.mark.asyncio
 async def test_apply_redaction_rectangles_pixels():
     # Create a white 100x100 image
     img = Image.new("RGB", (100, 100), color=(255, 255, 255))
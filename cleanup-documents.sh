@@ -19,4 +19,4 @@ if [ ! -f "backend/cleanup_documents.py" ]; then
 fi
 
 # Run the Python cleanup script
-python3 backend/cleanup_documents.py
+python3 backend/cleanup_documents.py --remote "$@"